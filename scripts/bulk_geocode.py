@@ -15,9 +15,13 @@ from typing import List, Dict, Optional
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
 
 from app.scraper.jecc_scraper import jecc_scraper
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, ReadSessionLocal
+from app.core.cache import cache, namespaces_for_days
 from app.models.db import JeccLog
-from sqlalchemy import func, and_
+from app.services.logs import logs_service
+from app.services.heatmap import heatmap_service
+from app.services.events import event_service, GEOCODED
+from sqlalchemy import func, and_, update
 
 
 class BulkGeocoder:
@@ -50,7 +54,8 @@ class BulkGeocoder:
     
     def analyze_dataset(self) -> Dict:
         """Analyze the dataset before geocoding"""
-        db = SessionLocal()
+        # Read-only counts; a replica can serve them without loading the primary
+        db = ReadSessionLocal()
         try:
             # Total records
             total_records = db.query(JeccLog).count()
@@ -210,20 +215,25 @@ class BulkGeocoder:
         db = SessionLocal()
         try:
             # Update all records with this address that don't have coordinates
-            updated = db.query(JeccLog)\
-                .filter(and_(
+            updated = db.execute(
+                update(JeccLog)
+                .where(and_(
                     JeccLog.address == address,
                     JeccLog.latitude.is_(None)
-                ))\
-                .update({
-                    'latitude': lat,
-                    'longitude': lon,
-                    'geocoded_address': formatted_address,
-                    'geocoded_at': datetime.utcnow()
-                })
+                ))
+                .values(logs_service.geocode_fields(lat, lon, formatted_address))
+                .returning(JeccLog.id, JeccLog.log_date)
+            ).all()
+            updated_dates = {row.log_date for row in updated}
+            
+            # Keep the density grids of the affected days current
+            heatmap_service.refresh_days(db, updated_dates)
             
             db.commit()
-            return updated
+            if updated:
+                cache.invalidate(*namespaces_for_days(updated_dates))
+                event_service.publish_logs(db, GEOCODED, [row.id for row in updated])
+            return len(updated)
         except Exception as e:
             print(f"   Error updating records: {e}")
             db.rollback()
@@ -244,14 +254,16 @@ class BulkGeocoder:
                 
                 # Update the record
                 old_lat = record.latitude
-                record.latitude = lat
-                record.longitude = lon
-                record.geocoded_address = formatted_address
-                record.geocoded_at = datetime.utcnow()
+                logs_service.apply_geocode(record, lat, lon, formatted_address)
+                db.flush()
+                record_id, record_date = record.id, record.log_date
+                heatmap_service.refresh_days(db, [record_date])
                 
                 print(f"   DB UPDATE: Setting lat={lat}, lon={lon} (was {old_lat})")
                 db.commit()
-                print(f"   DB COMMITTED for ID {record.id}")
+                cache.invalidate(*namespaces_for_days([record_date]))
+                event_service.publish_logs(db, GEOCODED, [record_id])
+                print(f"   DB COMMITTED for ID {record_id}")
                 
                 return True, "Success"
             else:
@@ -5,7 +5,9 @@ Usage:
     python scripts/run_scraper.py                    # Scrape last 7 days
     python scripts/run_scraper.py --days 30          # Scrape last 30 days
     python scripts/run_scraper.py --date 2024-01-15  # Scrape specific date
+    python scripts/run_scraper.py --days 90 --concurrency 8  # Fetch 8 days in parallel
     python scripts/run_scraper.py --geocode-only     # Only geocode existing logs
+    python scripts/run_scraper.py --backfill-summaries  # Rebuild facet/rollup tables
 """
 
 import sys
@@ -25,8 +27,12 @@ def main():
     parser.add_argument('--date', type=str, help='Specific date to scrape (YYYY-MM-DD)')
     parser.add_argument('--start-date', type=str, help='Start date for range scraping (YYYY-MM-DD)')
     parser.add_argument('--end-date', type=str, help='End date for range scraping (YYYY-MM-DD)')
+    parser.add_argument('--concurrency', type=int,
+                        help='Days fetched in parallel (default: SCRAPE_CONCURRENCY)')
     parser.add_argument('--geocode-only', action='store_true', help='Only geocode existing logs')
     parser.add_argument('--geocode-limit', type=int, default=50, help='Limit for geocoding batch')
+    parser.add_argument('--backfill-summaries', action='store_true',
+                        help='Rebuild facet and rollup tables (all history, or --start-date/--end-date)')
     
     args = parser.parse_args()
     
@@ -36,6 +42,13 @@ def main():
             count = jecc_scraper.geocode_recent_logs(args.geocode_limit)
             print(f"Successfully geocoded {count} logs")
             
+        elif args.backfill_summaries:
+            start = datetime.strptime(args.start_date, '%Y-%m-%d') if args.start_date else None
+            end = datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else None
+            print("Rebuilding summary tables...")
+            days = jecc_scraper.backfill_summaries(start, end)
+            print(f"Successfully rebuilt summaries for {days} days")
+            
         elif args.date:
             # Scrape specific date
             target_date = datetime.strptime(args.date, '%Y-%m-%d')
@@ -48,13 +61,13 @@ def main():
             start = datetime.strptime(args.start_date, '%Y-%m-%d')
             end = datetime.strptime(args.end_date, '%Y-%m-%d')
             print(f"Scraping logs from {start.strftime('%m/%d/%Y')} to {end.strftime('%m/%d/%Y')}...")
-            count = jecc_scraper.scrape_date_range(start, end)
+            count = jecc_scraper.scrape_date_range(start, end, args.concurrency)
             print(f"Successfully processed {count} new logs")
             
         else:
             # Scrape recent days
             print(f"Scraping logs for the last {args.days} days...")
-            count = jecc_scraper.scrape_recent_days(args.days)
+            count = jecc_scraper.scrape_recent_days(args.days, args.concurrency)
             print(f"Successfully processed {count} new logs")
             
             # Also geocode some recent logs
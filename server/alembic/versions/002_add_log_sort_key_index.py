@@ -0,0 +1,33 @@
+"""Add composite sort key index for keyset pagination
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covers ORDER BY log_date DESC, log_time DESC, id DESC (NULL times first)
+    op.create_index(
+        'ix_jecc_logs_sort_key',
+        'jecc_logs',
+        [
+            sa.text('log_date DESC'),
+            sa.text("COALESCE(log_time, '24:00:00'::time) DESC"),
+            sa.text('id DESC'),
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jecc_logs_sort_key', table_name='jecc_logs')
@@ -0,0 +1,42 @@
+"""Add geohash column to jecc_logs for map clustering
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services import geohash
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jecc_logs', sa.Column('geohash', sa.String(12), nullable=True))
+    
+    # Backfill geohashes for logs that are already geocoded
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, latitude, longitude FROM jecc_logs "
+        "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    )).fetchall()
+    updates = [
+        {"id": row.id, "geohash": geohash.encode(float(row.latitude), float(row.longitude))}
+        for row in rows
+    ]
+    if updates:
+        conn.execute(sa.text("UPDATE jecc_logs SET geohash = :geohash WHERE id = :id"), updates)
+    
+    op.create_index('ix_jecc_logs_geohash', 'jecc_logs', ['geohash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jecc_logs_geohash', table_name='jecc_logs')
+    op.drop_column('jecc_logs', 'geohash')
@@ -0,0 +1,29 @@
+"""Add generated location point column with GiST index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Postgres keeps the point in sync with latitude/longitude on every write
+    op.execute(
+        "ALTER TABLE jecc_logs ADD COLUMN location point "
+        "GENERATED ALWAYS AS (point(longitude::float8, latitude::float8)) STORED"
+    )
+    op.create_index('ix_jecc_logs_location', 'jecc_logs', ['location'], postgresql_using='gist')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jecc_logs_location', table_name='jecc_logs')
+    op.drop_column('jecc_logs', 'location')
@@ -0,0 +1,63 @@
+"""Add trigram indexes and agency/call type lookup tables
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Trigram indexes for substring (ILIKE '%x%') filters
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_jecc_logs_agency_trgm', 'jecc_logs', ['agency'],
+        postgresql_using='gin', postgresql_ops={'agency': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_jecc_logs_call_type_trgm', 'jecc_logs', ['call_type'],
+        postgresql_using='gin', postgresql_ops={'call_type': 'gin_trgm_ops'}
+    )
+    
+    # Lookup tables
+    op.create_table(
+        'agencies',
+        sa.Column('id', sa.SmallInteger(), primary_key=True),
+        sa.Column('name', sa.Text(), nullable=False, unique=True),
+    )
+    op.create_table(
+        'call_types',
+        sa.Column('id', sa.SmallInteger(), primary_key=True),
+        sa.Column('name', sa.Text(), nullable=False, unique=True),
+    )
+    op.add_column('jecc_logs', sa.Column('agency_id', sa.SmallInteger(), sa.ForeignKey('agencies.id'), nullable=True))
+    op.add_column('jecc_logs', sa.Column('call_type_id', sa.SmallInteger(), sa.ForeignKey('call_types.id'), nullable=True))
+    
+    # Backfill from the existing text columns
+    op.execute("INSERT INTO agencies (name) SELECT DISTINCT agency FROM jecc_logs WHERE agency IS NOT NULL")
+    op.execute("INSERT INTO call_types (name) SELECT DISTINCT call_type FROM jecc_logs WHERE call_type IS NOT NULL")
+    op.execute("UPDATE jecc_logs SET agency_id = a.id FROM agencies a WHERE a.name = jecc_logs.agency")
+    op.execute("UPDATE jecc_logs SET call_type_id = c.id FROM call_types c WHERE c.name = jecc_logs.call_type")
+    
+    op.create_index('ix_jecc_logs_agency_id', 'jecc_logs', ['agency_id'])
+    op.create_index('ix_jecc_logs_call_type_id', 'jecc_logs', ['call_type_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jecc_logs_call_type_id', table_name='jecc_logs')
+    op.drop_index('ix_jecc_logs_agency_id', table_name='jecc_logs')
+    op.drop_column('jecc_logs', 'call_type_id')
+    op.drop_column('jecc_logs', 'agency_id')
+    op.drop_table('call_types')
+    op.drop_table('agencies')
+    op.drop_index('ix_jecc_logs_call_type_trgm', table_name='jecc_logs')
+    op.drop_index('ix_jecc_logs_agency_trgm', table_name='jecc_logs')
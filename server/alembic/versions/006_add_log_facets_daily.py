@@ -0,0 +1,38 @@
+"""Add per-day facet summary table
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'log_facets_daily',
+        sa.Column('log_date', sa.Date(), primary_key=True),
+        sa.Column('dimension', sa.String(16), primary_key=True),
+        sa.Column('value', sa.Text(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    
+    # Backfill from existing logs; the scraper keeps it current afterwards
+    for dimension in ('agency', 'call_type', 'disposition'):
+        op.execute(
+            f"INSERT INTO log_facets_daily (log_date, dimension, value, count) "
+            f"SELECT log_date, '{dimension}', {dimension}, COUNT(*) FROM jecc_logs "
+            f"WHERE {dimension} IS NOT NULL GROUP BY log_date, {dimension}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('log_facets_daily')
@@ -0,0 +1,53 @@
+"""Add hourly and daily call count rollup tables
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'log_counts_daily',
+        sa.Column('log_date', sa.Date(), primary_key=True),
+        sa.Column('agency', sa.Text(), primary_key=True),
+        sa.Column('call_type', sa.Text(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        'log_counts_hourly',
+        sa.Column('log_date', sa.Date(), primary_key=True),
+        sa.Column('hour', sa.SmallInteger(), primary_key=True),
+        sa.Column('agency', sa.Text(), primary_key=True),
+        sa.Column('call_type', sa.Text(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    
+    # Backfill from existing logs; the scraper keeps them current afterwards and
+    # `scripts/run_scraper.py --backfill-summaries` rebuilds them on demand
+    op.execute(
+        "INSERT INTO log_counts_daily (log_date, agency, call_type, count) "
+        "SELECT log_date, COALESCE(agency, ''), COALESCE(call_type, ''), COUNT(*) FROM jecc_logs "
+        "GROUP BY log_date, COALESCE(agency, ''), COALESCE(call_type, '')"
+    )
+    op.execute(
+        "INSERT INTO log_counts_hourly (log_date, hour, agency, call_type, count) "
+        "SELECT log_date, EXTRACT(hour FROM log_time)::smallint, COALESCE(agency, ''), COALESCE(call_type, ''), COUNT(*) "
+        "FROM jecc_logs WHERE log_time IS NOT NULL "
+        "GROUP BY log_date, EXTRACT(hour FROM log_time)::smallint, COALESCE(agency, ''), COALESCE(call_type, '')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('log_counts_hourly')
+    op.drop_table('log_counts_daily')
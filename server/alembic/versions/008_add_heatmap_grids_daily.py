@@ -0,0 +1,32 @@
+"""Add per-day heatmap density grid table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Grids are built with NumPy; populate existing history with
+    # `scripts/run_scraper.py --backfill-summaries`
+    op.create_table(
+        'heatmap_grids_daily',
+        sa.Column('log_date', sa.Date(), primary_key=True),
+        sa.Column('call_type', sa.Text(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('cells', sa.LargeBinary(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('heatmap_grids_daily')
@@ -0,0 +1,24 @@
+"""Add (updated_at, id) index for incremental change feeds
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covers WHERE (updated_at, id) > (:ts, :id) ORDER BY updated_at, id
+    op.create_index('ix_jecc_logs_updated_at_id', 'jecc_logs', ['updated_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jecc_logs_updated_at_id', table_name='jecc_logs')
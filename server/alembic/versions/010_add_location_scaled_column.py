@@ -0,0 +1,30 @@
+"""Add longitude-scaled location point column with GiST index
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Longitude scaled by cos(41.6°) (LONGITUDE_SCALE in app/models/db.py) so
+    # KNN scans order logs by distance rather than by raw degrees
+    op.execute(
+        "ALTER TABLE jecc_logs ADD COLUMN location_scaled point "
+        "GENERATED ALWAYS AS (point(longitude::float8 * 0.747798, latitude::float8)) STORED"
+    )
+    op.create_index('ix_jecc_logs_location_scaled', 'jecc_logs', ['location_scaled'], postgresql_using='gist')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jecc_logs_location_scaled', table_name='jecc_logs')
+    op.drop_column('jecc_logs', 'location_scaled')
@@ -0,0 +1,129 @@
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy import desc, func, literal_column, tuple_
+
+from app.models.db import JeccLog
+
+# NULL log_time sorts first under DESC in Postgres; coalescing to 24:00 keeps
+# that ordering while giving keyset comparisons a non-null value to work with.
+LOG_SORT_TIME = func.coalesce(JeccLog.log_time, literal_column("'24:00:00'::time"))
+
+LOG_ORDER_DESC = (desc(JeccLog.log_date), desc(LOG_SORT_TIME), desc(JeccLog.id))
+LOG_ORDER_ASC = (JeccLog.log_date, LOG_SORT_TIME, JeccLog.id)
+
+CursorKey = Tuple[date, time, int]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def sort_key(log: JeccLog) -> CursorKey:
+    """Return the (log_date, log_time, id) sort key for a log"""
+    return (log.log_date, log.log_time or time.max, log.id)
+
+
+def encode_cursor(key: CursorKey, direction: str) -> str:
+    """Encode a sort key and paging direction as an opaque token"""
+    log_date, log_time, log_id = key
+    payload = [log_date.isoformat(), None if log_time == time.max else log_time.isoformat(), log_id, direction]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[CursorKey, str]:
+    """Decode a token produced by encode_cursor into (sort key, direction)"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        log_date, log_time, log_id, direction = json.loads(raw)
+        key = (
+            date.fromisoformat(log_date),
+            time.fromisoformat(log_time) if log_time else time.max,
+            int(log_id),
+        )
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+    if direction not in ("next", "prev"):
+        raise InvalidCursor(token)
+    return key, direction
+
+
+def encode_change_token(updated_at: datetime, log_id: int) -> str:
+    """Encode a /logs/changes watermark as an opaque token"""
+    raw = json.dumps([updated_at.isoformat(), log_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_change_token(token: str) -> Tuple[datetime, int]:
+    """Decode a token produced by encode_change_token into (updated_at, id)"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        updated_at, log_id = json.loads(raw)
+        return datetime.fromisoformat(updated_at), int(log_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+
+
+def keyset_filter(key: CursorKey, direction: str):
+    """Filter selecting rows strictly after (next) or before (prev) the key"""
+    log_date, log_time, log_id = key
+    # time.max stands in for NULL, which the sort expression maps to 24:00
+    sort_time = literal_column("'24:00:00'::time") if log_time == time.max else log_time
+    columns = tuple_(JeccLog.log_date, LOG_SORT_TIME, JeccLog.id)
+    bound = tuple_(log_date, sort_time, log_id)
+    return columns < bound if direction == "next" else columns > bound
+
+
+def page_cursors(rows: list, has_next: bool, has_prev: bool) -> Tuple[Optional[str], Optional[str]]:
+    """Build next/prev cursors from the first and last rows of a page"""
+    if not rows:
+        return None, None
+    next_cursor = encode_cursor(sort_key(rows[-1]), "next") if has_next else None
+    prev_cursor = encode_cursor(sort_key(rows[0]), "prev") if has_prev else None
+    return next_cursor, prev_cursor
+
+
+def pack_window(ids: list, complete: bool) -> bytes:
+    """Pack an ordered id window as a completeness flag byte followed by little-endian int32 ids"""
+    return bytes([complete]) + np.asarray(ids, dtype="<i4").tobytes()
+
+
+def unpack_window(data: bytes) -> Tuple[np.ndarray, bool]:
+    """Inverse of pack_window(); the id array is a read-only view of data"""
+    return np.frombuffer(data, dtype="<i4", offset=1), bool(data[0])
+
+
+def window_page(
+    window: np.ndarray,
+    complete: bool,
+    per_page: int,
+    page: int = 1,
+    keyset: Optional[Tuple[CursorKey, str]] = None,
+) -> Optional[Tuple[list, bool, bool]]:
+    """
+    Slice a page of ids out of an ordered id window
+    Returns (ids, has_next, has_prev), or None when the page is not known to
+    lie entirely inside the window and has to be read from the table.
+    """
+    if keyset:
+        key, direction = keyset
+        position = np.flatnonzero(window == key[2])
+        if not len(position):
+            return None
+        position = int(position[0])
+        if direction == "prev":
+            start = max(position - per_page, 0)
+            return window[start:position].tolist(), True, start > 0
+        start = position + 1
+    else:
+        start = (page - 1) * per_page
+    # One extra id tells whether there is a next page
+    stop = start + per_page + 1
+    if stop > len(window) and not complete:
+        return None
+    ids = window[start:stop].tolist()
+    return ids[:per_page], len(ids) > per_page, bool(keyset) or start > 0
@@ -1,39 +1,167 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, text
-from typing import Optional
-from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import BigInteger, Float, and_, cast, desc, func, select, text, tuple_
+from typing import Literal, Optional
+from datetime import date, time, timedelta
 import hashlib
+import orjson
 
-from app.core.database import get_db
-from app.core.cache import cache
+from app.core.database import get_async_db, get_async_read_db
+from app.core.cache import async_cache, range_policy, versioned_key, LOGS_NAMESPACE, LOG_NAMESPACE, HISTORY_NAMESPACE
+from app.core.config import settings
 from app.models.db import JeccLog
-from app.api.v1.schemas import JeccLog as JeccLogSchema, LogsResponse, HealthResponse
+from app.services.logs import logs_service
+from app.services.summaries import summary_service
+from app.services.heatmap import heatmap_service, HEATMAP_BOUNDS, GRID_SIZE
+from app.services.export import export_service, EXPORT_COLUMNS, EXPORT_MEDIA_TYPES
+from app.services.events import event_hub
+from app.services import geohash, spatial
+from app.api.v1.pagination import (
+    InvalidCursor, LOG_ORDER_ASC, LOG_ORDER_DESC, decode_cursor, keyset_filter, page_cursors,
+    pack_window, unpack_window, window_page, encode_change_token, decode_change_token
+)
+from app.api.v1.schemas import (
+    JeccLog as JeccLogSchema, NearestLog, LogsResponse, LogBatchRequest, LogBatchResponse, LogChangesResponse, MapLogsResponse, LogCluster, ClustersResponse,
+    FacetsResponse, TimeseriesResponse, HealthResponse
+)
 
 router = APIRouter()
 
+# Upper bound on ids per /logs/batch request
+MAX_BATCH_IDS = 500
+
 
 def generate_cache_key(prefix: str, **kwargs) -> str:
     """Generate a cache key from parameters"""
     key_data = f"{prefix}:{':'.join(f'{k}={v}' for k, v in sorted(kwargs.items()))}"
-    return hashlib.md5(key_data.encode()).hexdigest()
+    return f"{prefix}:{hashlib.md5(key_data.encode()).hexdigest()}"
+
+
+def json_response(body: bytes, headers: Optional[dict] = None, **fields) -> Response:
+    """Send a pre-rendered JSON object as-is, appending fields without re-parsing it"""
+    if fields:
+        body = body[:-1] + b"," + orjson.dumps(fields)[1:]
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def check_etag(request: Request, response: Response) -> Optional[str]:
+    """Dependency that answers a matching If-None-Match with 304 before any other work.
+
+    The ETag is weak and combines the data version, which every cache
+    invalidation bumps, with the path and query. It is also set on the
+    injected response; handlers that return their own Response must copy it,
+    and leave it out when serving a value cached before the last invalidation.
+    """
+    version = await async_cache.data_version()
+    if version is None:
+        return None
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.md5(f"{request.url.path}?{query}".encode()).hexdigest()
+    etag = f'W/"{version}-{digest}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
+
+
+def etag_headers(etag: Optional[str]) -> Optional[dict]:
+    return {"ETag": etag} if etag else None
+
+
+def parse_bbox(bbox: str) -> tuple:
+    """Parse a "min_lon,min_lat,max_lon,max_lat" bounding box"""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+    if min_lon > max_lon or min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="bbox minimums must not exceed maximums")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def parse_point(point: str) -> tuple:
+    """Parse a "lat,lon" coordinate"""
+    try:
+        lat, lon = (float(v) for v in point.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="near must be lat,lon")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise HTTPException(status_code=400, detail="near is out of range")
+    return lat, lon
+
+
+async def load_logs(db: AsyncSession, ids: list) -> dict:
+    """Serialized logs by id, from the per-log cache with one MGET and the database for misses.
+
+    Misses are read with a single query and written back in one pipeline.
+    Ids that match no log are left out of the result. Per-log entries skip the
+    in-process tier: a 1000-row page would otherwise evict most of it.
+    """
+    generation = await async_cache.generation(LOG_NAMESPACE)
+    keys = [versioned_key(LOG_NAMESPACE, generation, str(log_id)) for log_id in ids]
+    found = {log_id: log for log_id, log in zip(ids, await async_cache.get_many(keys, local=False)) if log}
+    
+    misses = [log_id for log_id in ids if log_id not in found]
+    if misses:
+        to_cache = {}
+        for log in await logs_service.get_logs_by_ids(db, misses):
+            found[log.id] = JeccLogSchema.model_validate(log).model_dump()
+            to_cache[versioned_key(LOG_NAMESPACE, generation, str(log.id))] = found[log.id]
+        await async_cache.set_many(to_cache, local=False)
+    
+    return found
+
+
+def parse_ids(ids: str) -> list:
+    """Parse a comma-separated id list"""
+    try:
+        return [int(v) for v in ids.split(",") if v.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+
+
+async def get_logs_batch(ids: list, db: AsyncSession) -> LogBatchResponse:
+    """Shared body of GET and POST /logs/batch; duplicate ids are returned once"""
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    logs = await load_logs(db, ids)
+    return LogBatchResponse(
+        logs=[logs[log_id] for log_id in ids if log_id in logs],
+        missing=[log_id for log_id in ids if log_id not in logs]
+    )
+
+
+def count_cache_keys(mode: str, **filter_params) -> list:
+    """Cache keys that can answer a total for a filter set, best first.
+
+    The count is independent of the page being requested, so every page of
+    the same filter combination shares these entries. An exact count
+    already in cache is reused for estimate requests.
+    """
+    if mode == "none":
+        return []
+    keys = [generate_cache_key("logs_count", mode="exact", **filter_params)]
+    if mode != "exact":
+        keys.append(generate_cache_key("logs_count", mode=mode, **filter_params))
+    return keys
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Health check endpoint"""
     try:
         # Test database
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception:
         db_status = "unhealthy"
     
     try:
-        # Test cache
-        cache.set("health_check", "test", 10)
-        cache_status = "healthy" if cache.get("health_check") == "test" else "unhealthy"
-        cache.delete("health_check")
+        # Test cache (Redis itself, not the in-process tier)
+        cache_status = "healthy" if await async_cache.ping() else "unhealthy"
     except Exception:
         cache_status = "unhealthy"
     
@@ -46,111 +174,647 @@ async def health_check(db: Session = Depends(get_db)):
 
 @router.get("/logs", response_model=LogsResponse)
 async def get_logs(
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored when a cursor is given)"),
     per_page: int = Query(50, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor/prev_cursor token from a previous page"),
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
     agency: Optional[str] = Query(None, description="Agency filter"),
     call_type: Optional[str] = Query(None, description="Call type filter"),
+    match: Literal["contains", "exact"] = Query(
+        "contains", description="Match agency/call_type as a substring or by exact name"
+    ),
     geocoded_only: Optional[bool] = Query(None, description="Only return geocoded logs"),
-    db: Session = Depends(get_db)
+    bbox: Optional[str] = Query(None, description="Only logs inside min_lon,min_lat,max_lon,max_lat"),
+    near: Optional[str] = Query(None, description="Only logs within radius_m of lat,lon"),
+    radius_m: Optional[float] = Query(None, gt=0, le=100000, description="Radius in meters for near"),
+    count: Literal["exact", "estimate", "none"] = Query(
+        "exact", description="How to compute total: exact COUNT(*), planner estimate, or skip"
+    ),
+    etag: Optional[str] = Depends(check_etag),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get logs with pagination and filtering"""
+    """Get logs with pagination and filtering.
+
+    Pages can be requested by number (page/per_page) or by following the
+    next_cursor/prev_cursor tokens returned with every page. The ordered ids
+    of the first result_window_size matches are cached per filter set, so
+    pages inside that window are a batch lookup by id. Past it, cursor
+    paging seeks on the (log_date, log_time, id) index and costs the same no
+    matter how deep the page is.
+    """
+    
+    keyset = None
+    if cursor:
+        try:
+            keyset = decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    if near and radius_m is None:
+        raise HTTPException(status_code=400, detail="radius_m is required with near")
+    if radius_m is not None and not near:
+        raise HTTPException(status_code=400, detail="near is required with radius_m")
+    
+    filter_params = dict(
+        start_date=start_date,
+        end_date=end_date,
+        agency=agency,
+        call_type=call_type,
+        geocoded_only=geocoded_only,
+        bbox=parse_bbox(bbox) if bbox else None,
+        near=parse_point(near) if near else None,
+        radius_m=radius_m,
+        exact_match=match == "exact"
+    )
     
     # Generate cache key
     cache_key = generate_cache_key(
         "logs",
         page=page,
         per_page=per_page,
+        cursor=cursor,
+        **filter_params
+    )
+    
+    # Build query with filters
+    filters = logs_service.build_filters(**filter_params)
+    query = select(JeccLog).where(*filters)
+    
+    # Try to get from cache first; the total is cached separately per filter set
+    # and fetched in the same round trip, along with the filter set's id window.
+    # Entries past their soft TTL, or missing right after an invalidation, are
+    # recomputed by one request at a time while concurrent requests are served
+    # the previous value.
+    policy = range_policy(start_date, end_date)
+    generation = await async_cache.generation(policy.namespace)
+    
+    def keys_for(key: str) -> tuple:
+        return versioned_key(policy.namespace, generation, key), versioned_key(policy.namespace, generation - 1, key)
+    
+    # Values read from the previous generation may predate the current data
+    # version, so a response built from any of them is sent without an ETag
+    served_stale = False
+    
+    def mark_stale() -> None:
+        nonlocal served_stale
+        served_stale = True
+    
+    page_keys = keys_for(cache_key)
+    window_keys = keys_for(generate_cache_key("logs_window", **filter_params))
+    count_keys = [keys_for(key) for key in count_cache_keys(count, **filter_params)]
+    cached_result, cached_window, *cached_totals = await async_cache.get_entries(
+        [page_keys[0], window_keys[0], *(keys[0] for keys in count_keys)]
+    )
+    
+    async def load_window() -> bytes:
+        # The first result_window_size matching ids in display order, plus
+        # whether that is all of them
+        ids = list(await db.scalars(
+            select(JeccLog.id).where(*filters)
+                              .order_by(*LOG_ORDER_DESC)
+                              .limit(settings.result_window_size + 1)
+        ))
+        complete = len(ids) <= settings.result_window_size
+        return pack_window(ids[:settings.result_window_size], complete)
+    
+    window, window_maybe_stale = None, False
+    
+    async def get_window(allow_stale: bool = False) -> tuple:
+        # A total may come from the previous generation's window while another
+        # worker builds the current one. Pages are cached as fresh, so they
+        # wait for the current window instead.
+        nonlocal window, window_maybe_stale
+        if window is None or (window_maybe_stale and not allow_stale):
+            window = unpack_window(await async_cache.get_or_compute(
+                window_keys[0], load_window, policy.ttl, policy.soft_ttl,
+                stale_key=window_keys[1] if allow_stale else None, cached=cached_window,
+                on_stale=mark_stale
+            ))
+            window_maybe_stale = allow_stale and cached_window is None
+        return window
+    
+    total, total_estimated = None, False
+    if count_keys:
+        # Prefer an exact count already in cache, then a window holding every
+        # match, else compute the requested kind
+        found = next((i for i, t in enumerate(cached_totals) if t is not None), None)
+        if found is None:
+            window_ids, complete = await get_window(allow_stale=True)
+            if complete:
+                total = len(window_ids)
+        if total is None:
+            found = len(count_keys) - 1 if found is None else found
+            # Key 0 holds exact counts; refreshing it must not store an estimate
+            mode = "exact" if found == 0 else count
+            total = await async_cache.get_or_compute(
+                count_keys[found][0],
+                lambda: logs_service.count_logs(db, filters, mode),
+                policy.ttl,
+                policy.soft_ttl,
+                stale_key=count_keys[found][1],
+                cached=cached_totals[found],
+                on_stale=mark_stale
+            )
+            total_estimated = mode == "estimate"
+    
+    async def load_page() -> bytes:
+        # Pages inside the id window are a slice of it plus a batch row fetch
+        window_ids, complete = await get_window()
+        sliced = window_page(window_ids, complete, per_page, page, keyset)
+        if sliced is not None:
+            ids, has_next, has_prev = sliced
+            rows = await load_logs(db, ids)
+            logs = [JeccLogSchema(**rows[log_id]) for log_id in ids if log_id in rows]
+        elif keyset:
+            # Seek past the cursor row, fetching one extra row to detect more pages
+            key, direction = keyset
+            order = LOG_ORDER_DESC if direction == "next" else LOG_ORDER_ASC
+            logs = list(await db.scalars(
+                query.where(keyset_filter(key, direction))
+                     .order_by(*order)
+                     .limit(per_page + 1)
+            ))
+            has_more = len(logs) > per_page
+            logs = logs[:per_page]
+            if direction == "next":
+                has_next, has_prev = has_more, True
+            else:
+                logs.reverse()
+                has_next, has_prev = True, has_more
+        else:
+            # Apply pagination and ordering, fetching one extra row so has_next
+            # does not depend on the total count
+            offset = (page - 1) * per_page
+            logs = list(await db.scalars(
+                query.order_by(*LOG_ORDER_DESC)
+                     .offset(offset)
+                     .limit(per_page + 1)
+            ))
+            
+            # Calculate pagination info
+            has_next = len(logs) > per_page
+            has_prev = page > 1
+            logs = logs[:per_page]
+        
+        next_cursor, prev_cursor = page_cursors(logs, has_next, has_prev)
+        
+        # Cached as rendered JSON without its total, which is shared by every
+        # page of the filter set and spliced in per request
+        return orjson.dumps(LogsResponse(
+            logs=[JeccLogSchema.model_validate(log) for log in logs],
+            page=page,
+            per_page=per_page,
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor
+        ).model_dump(mode="json", exclude={"total", "total_estimated"}))
+    
+    body = await async_cache.get_or_compute(
+        page_keys[0], load_page, policy.ttl, policy.soft_ttl,
+        stale_key=page_keys[1], cached=cached_result, on_stale=mark_stale
+    )
+    headers = None if served_stale else etag_headers(etag)
+    return json_response(body, headers, total=total, total_estimated=total_estimated)
+
+
+@router.get("/logs/map", response_model=MapLogsResponse)
+async def get_map_logs(
+    limit: int = Query(1000, ge=1, le=50000, description="Maximum number of points"),
+    start_date: Optional[date] = Query(None, description="Start date filter"),
+    end_date: Optional[date] = Query(None, description="End date filter"),
+    agency: Optional[str] = Query(None, description="Agency filter"),
+    call_type: Optional[str] = Query(None, description="Call type filter"),
+    bbox: Optional[str] = Query(None, description="Only logs inside min_lon,min_lat,max_lon,max_lat"),
+    quantize: bool = Query(False, description="Round coordinates to 5 decimal places (~1 m)"),
+    etag: Optional[str] = Depends(check_etag),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get the most recent geocoded logs as compact parallel arrays for map markers.
+
+    Only the columns needed to draw a marker are selected, and rows are read
+    as Core tuples rather than hydrated ORM objects. Call types are
+    dictionary-encoded and times are seconds since the epoch of the naive
+    local log timestamp.
+    """
+    
+    bounds = parse_bbox(bbox) if bbox else None
+    
+    policy = range_policy(start_date, end_date)
+    cache_key = await async_cache.namespaced_key(policy.namespace, generate_cache_key(
+        "logs_map",
+        limit=limit,
         start_date=start_date,
         end_date=end_date,
         agency=agency,
         call_type=call_type,
-        geocoded_only=geocoded_only
-    )
+        bbox=bounds,
+        quantize=quantize
+    ))
     
-    # Try to get from cache first
-    cached_result = cache.get(cache_key)
+    # Map payloads are large; hits are sent as the stored JSON without re-encoding
+    cached_result = await async_cache.get_entry(cache_key)
     if cached_result:
-        return LogsResponse(**cached_result)
-    
-    # Build query
-    query = db.query(JeccLog)
-    
-    # Apply filters
-    filters = []
-    if start_date:
-        filters.append(JeccLog.log_date >= start_date)
-    if end_date:
-        filters.append(JeccLog.log_date <= end_date)
-    if agency:
-        filters.append(JeccLog.agency.ilike(f"%{agency}%"))
-    if call_type:
-        filters.append(JeccLog.call_type.ilike(f"%{call_type}%"))
-    if geocoded_only:
-        filters.append(JeccLog.latitude.isnot(None))
-        filters.append(JeccLog.longitude.isnot(None))
-    
-    if filters:
-        query = query.filter(and_(*filters))
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination and ordering
-    offset = (page - 1) * per_page
-    logs = query.order_by(desc(JeccLog.log_date), desc(JeccLog.log_time))\
-               .offset(offset)\
-               .limit(per_page)\
-               .all()
-    
-    # Calculate pagination info
-    has_next = offset + per_page < total
-    has_prev = page > 1
-    
-    result = LogsResponse(
-        logs=[JeccLogSchema.model_validate(log) for log in logs],
-        total=total,
-        page=page,
-        per_page=per_page,
-        has_next=has_next,
-        has_prev=has_prev
+        return json_response(cached_result[1], etag_headers(etag))
+    
+    filters = logs_service.build_filters(start_date, end_date, agency, call_type, geocoded_only=True, bbox=bounds)
+    log_timestamp = JeccLog.log_date + func.coalesce(JeccLog.log_time, time(0))
+    stmt = select(
+        JeccLog.id,
+        cast(JeccLog.latitude, Float),
+        cast(JeccLog.longitude, Float),
+        JeccLog.call_type,
+        cast(func.extract("epoch", log_timestamp), BigInteger),
+    ).where(and_(*filters)).order_by(*LOG_ORDER_DESC).limit(limit)
+    
+    ids, lats, lons, codes, times = [], [], [], [], []
+    call_types: dict = {}
+    for log_id, lat, lon, log_call_type, epoch in await db.execute(stmt):
+        if quantize:
+            lat, lon = round(lat, 5), round(lon, 5)
+        ids.append(log_id)
+        lats.append(lat)
+        lons.append(lon)
+        codes.append(call_types.setdefault(log_call_type, len(call_types)))
+        times.append(epoch)
+    
+    result = MapLogsResponse(
+        count=len(ids),
+        ids=ids,
+        lat=lats,
+        lon=lons,
+        call_type_codes=codes,
+        call_types=list(call_types),
+        times=times
+    ).model_dump()
+    
+    body = orjson.dumps(result)
+    await async_cache.set_entry(cache_key, body, policy.soft_ttl, policy.ttl)
+    
+    return json_response(body, etag_headers(etag))
+
+
+@router.get("/logs/clusters", response_model=ClustersResponse, dependencies=[Depends(check_etag)])
+async def get_log_clusters(
+    bbox: str = Query(..., description="Viewport as min_lon,min_lat,max_lon,max_lat"),
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level"),
+    start_date: Optional[date] = Query(None, description="Start date filter"),
+    end_date: Optional[date] = Query(None, description="End date filter"),
+    agency: Optional[str] = Query(None, description="Agency filter"),
+    call_type: Optional[str] = Query(None, description="Call type filter"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Aggregate geocoded logs in a viewport into geohash cells sized for the zoom level.
+
+    Each cluster reports its log count and centroid. The response size is
+    bounded by the number of cells in view, not by the number of logs.
+    """
+    
+    min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+    precision = geohash.precision_for_zoom(zoom)
+    
+    policy = range_policy(start_date, end_date)
+    cache_key = await async_cache.namespaced_key(policy.namespace, generate_cache_key(
+        "logs_clusters",
+        bbox=(min_lon, min_lat, max_lon, max_lat),
+        precision=precision,
+        start_date=start_date,
+        end_date=end_date,
+        agency=agency,
+        call_type=call_type
+    ))
+    
+    cached_result = await async_cache.get(cache_key)
+    if cached_result:
+        return ClustersResponse(**cached_result, zoom=zoom)
+    
+    filters = logs_service.build_filters(
+        start_date, end_date, agency, call_type,
+        geocoded_only=True, bbox=(min_lon, min_lat, max_lon, max_lat)
     )
+    filters.append(JeccLog.geohash.isnot(None))
+    cell = func.left(JeccLog.geohash, precision).label("cell")
+    count = func.count(JeccLog.id).label("count")
+    stmt = select(
+        cell,
+        count,
+        func.avg(cast(JeccLog.latitude, Float)),
+        func.avg(cast(JeccLog.longitude, Float)),
+        func.min(JeccLog.id),
+    ).where(and_(*filters)).group_by(cell).order_by(desc(count))
     
-    # Cache the result
-    cache.set(cache_key, result.model_dump())
+    clusters = [
+        LogCluster(
+            geohash=cell_hash,
+            count=cell_count,
+            lat=lat,
+            lon=lon,
+            log_id=first_id if cell_count == 1 else None
+        )
+        for cell_hash, cell_count, lat, lon, first_id in await db.execute(stmt)
+    ]
+    
+    result = ClustersResponse(
+        zoom=zoom,
+        precision=precision,
+        total=sum(c.count for c in clusters),
+        clusters=clusters
+    )
+    
+    await async_cache.set(cache_key, result.model_dump(exclude={"zoom"}), policy.ttl)
     
     return result
 
 
-@router.get("/logs/{log_id}", response_model=JeccLogSchema)
-async def get_log_by_id(log_id: int, db: Session = Depends(get_db)):
+@router.get("/logs/nearest", response_model=list[NearestLog], dependencies=[Depends(check_etag)])
+async def get_nearest_logs(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude"),
+    k: int = Query(10, ge=1, le=100, description="Number of logs to return"),
+    start_date: Optional[date] = Query(None, description="Start date filter"),
+    end_date: Optional[date] = Query(None, description="End date filter"),
+    agency: Optional[str] = Query(None, description="Agency filter"),
+    call_type: Optional[str] = Query(None, description="Call type filter"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get the k logs nearest to a coordinate, closest first.
+
+    Candidates come from a k-nearest-neighbour scan of the GiST index on
+    the longitude-scaled location and are re-ranked by distance in meters.
+    """
+    
+    policy = range_policy(start_date, end_date)
+    cache_key = await async_cache.namespaced_key(policy.namespace, generate_cache_key(
+        "logs_nearest",
+        lat=lat,
+        lon=lon,
+        k=k,
+        start_date=start_date,
+        end_date=end_date,
+        agency=agency,
+        call_type=call_type
+    ))
+    
+    cached_result = await async_cache.get(cache_key)
+    if cached_result:
+        return cached_result
+    
+    filters = logs_service.build_filters(start_date, end_date, agency, call_type, geocoded_only=True)
+    # The scan uses one reference latitude for the whole county; a small
+    # over-fetch absorbs the difference before re-ranking in meters
+    candidates = (await db.execute(
+        select(JeccLog, spatial.distance_m(lat, lon).label("distance_m"))
+        .where(and_(*filters))
+        .order_by(spatial.nearest_order(lat, lon))
+        .limit(k * 2)
+    )).all()
+    candidates.sort(key=lambda row: row.distance_m)
+    
+    result = [
+        NearestLog(**JeccLogSchema.model_validate(log).model_dump(), distance_m=distance)
+        for log, distance in candidates[:k]
+    ]
+    
+    await async_cache.set(cache_key, [log.model_dump() for log in result], policy.ttl)
+    
+    return result
+
+
+@router.get("/logs/export")
+async def export_logs(
+    format: Literal["ndjson", "csv", "parquet"] = Query("ndjson", description="Export file format"),
+    start_date: Optional[date] = Query(None, description="Start date filter"),
+    end_date: Optional[date] = Query(None, description="End date filter"),
+    agency: Optional[str] = Query(None, description="Agency filter"),
+    call_type: Optional[str] = Query(None, description="Call type filter"),
+    match: Literal["contains", "exact"] = Query(
+        "contains", description="Match agency/call_type as a substring or by exact name"
+    ),
+    geocoded_only: Optional[bool] = Query(None, description="Only return geocoded logs"),
+    bbox: Optional[str] = Query(None, description="Only logs inside min_lon,min_lat,max_lon,max_lat")
+):
+    """Stream every log matching the filters, newest first.
+
+    The whole export is one query read through a server-side cursor in
+    fixed-size batches, so memory stays flat regardless of result size.
+    """
+    
+    filters = logs_service.build_filters(
+        start_date, end_date, agency, call_type, geocoded_only,
+        bbox=parse_bbox(bbox) if bbox else None,
+        exact_match=match == "exact"
+    )
+    stmt = select(*EXPORT_COLUMNS).where(and_(*filters)).order_by(*LOG_ORDER_DESC)
+    
+    filename = f"jecc_logs_{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        export_service.stream(stmt, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/logs/changes", response_model=LogChangesResponse)
+async def get_log_changes(
+    since: Optional[str] = Query(None, description="next_token from a previous call; omit to start from the beginning"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of logs"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get logs inserted, updated or geocoded after a watermark.
+
+    Rows are returned in (updated_at, id) order from an index range scan.
+    Keep calling with next_token until has_more is false to sync a mirror.
+    Changes younger than changes_settle_seconds are held back until
+    concurrent writes have committed. Served by the primary, since a
+    lagging replica could hand out a watermark past rows it has not
+    replayed yet.
+    """
+    
+    query = select(JeccLog).where(
+        JeccLog.updated_at <= func.now() - timedelta(seconds=settings.changes_settle_seconds)
+    )
+    if since:
+        try:
+            updated_at, log_id = decode_change_token(since)
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid since token")
+        query = query.where(tuple_(JeccLog.updated_at, JeccLog.id) > tuple_(updated_at, log_id))
+    
+    logs = list(await db.scalars(query.order_by(JeccLog.updated_at, JeccLog.id).limit(limit + 1)))
+    has_more = len(logs) > limit
+    logs = logs[:limit]
+    
+    return LogChangesResponse(
+        logs=[JeccLogSchema.model_validate(log) for log in logs],
+        next_token=encode_change_token(logs[-1].updated_at, logs[-1].id) if logs else since,
+        has_more=has_more
+    )
+
+
+@router.get("/logs/stream")
+async def stream_logs():
+    """Server-Sent Events feed of log changes.
+
+    Emits inserted, updated and geocoded events as the scraper and
+    geocoders commit them; each data line is {"event": ..., "log": {...}}
+    with the log in the same shape as /logs/export rows.
+    """
+    return StreamingResponse(
+        event_hub.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/logs/batch", response_model=LogBatchResponse, dependencies=[Depends(check_etag)])
+async def get_logs_by_ids(
+    ids: str = Query(..., description="Comma-separated log ids"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get several logs by id, e.g. every marker in a map cluster.
+
+    Cached logs come from one Redis MGET and the rest from one database
+    query, whatever the number of ids.
+    """
+    return await get_logs_batch(parse_ids(ids), db)
+
+
+@router.post("/logs/batch", response_model=LogBatchResponse)
+async def post_logs_by_ids(request: LogBatchRequest, db: AsyncSession = Depends(get_async_read_db)):
+    """Get several logs by id, for id lists too long for a query string"""
+    return await get_logs_batch(request.ids, db)
+
+
+@router.get("/logs/{log_id}", response_model=JeccLogSchema, dependencies=[Depends(check_etag)])
+async def get_log_by_id(log_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific log by ID"""
     
     # Try cache first
-    cache_key = f"log:{log_id}"
-    cached_log = cache.get(cache_key)
+    cache_key = await async_cache.namespaced_key(LOG_NAMESPACE, str(log_id))
+    cached_log = await async_cache.get(cache_key)
     if cached_log:
         return JeccLogSchema(**cached_log)
     
     # Query database
-    log = db.query(JeccLog).filter(JeccLog.id == log_id).first()
+    log = await db.get(JeccLog, log_id)
     if not log:
         raise HTTPException(status_code=404, detail="Log not found")
     
     result = JeccLogSchema.model_validate(log)
     
     # Cache the result
-    cache.set(cache_key, result.model_dump())
+    await async_cache.set(cache_key, result.model_dump())
     
     return result
 
 
+@router.get("/facets", response_model=FacetsResponse, dependencies=[Depends(check_etag)])
+async def get_facets(
+    start_date: Optional[date] = Query(None, description="Start date filter"),
+    end_date: Optional[date] = Query(None, description="End date filter"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get distinct agencies, call types and dispositions with counts.
+
+    Reads the per-day summary table maintained by the scraper, never the
+    raw logs table.
+    """
+    
+    policy = range_policy(start_date, end_date)
+    cache_key = await async_cache.namespaced_key(
+        policy.namespace, generate_cache_key("facets", start_date=start_date, end_date=end_date)
+    )
+    cached_result = await async_cache.get(cache_key)
+    if cached_result:
+        return cached_result
+    
+    facets = await summary_service.get_facets(db, start_date, end_date)
+    result = FacetsResponse(
+        agencies=facets["agency"],
+        call_types=facets["call_type"],
+        dispositions=facets["disposition"]
+    ).model_dump()
+    
+    await async_cache.set(cache_key, result, policy.ttl)
+    
+    return result
+
+
+@router.get("/stats/timeseries", response_model=TimeseriesResponse, dependencies=[Depends(check_etag)])
+async def get_stats_timeseries(
+    interval: Literal["hour", "day", "week"] = Query("day", description="Bucket size"),
+    start_date: Optional[date] = Query(None, description="Start date filter"),
+    end_date: Optional[date] = Query(None, description="End date filter"),
+    agency: Optional[str] = Query(None, description="Exact agency name"),
+    call_type: Optional[str] = Query(None, description="Exact call type name"),
+    group_by: Optional[Literal["agency", "call_type"]] = Query(None, description="Split series by dimension"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get call counts per hour, day or week.
+
+    Reads only the hourly/daily rollup tables, so the cost depends on the
+    number of buckets rather than the number of logs. Hourly buckets leave
+    out logs without a recorded time.
+    """
+    
+    policy = range_policy(start_date, end_date)
+    cache_key = await async_cache.namespaced_key(policy.namespace, generate_cache_key(
+        "stats_timeseries",
+        interval=interval,
+        start_date=start_date,
+        end_date=end_date,
+        agency=agency,
+        call_type=call_type,
+        group_by=group_by
+    ))
+    cached_result = await async_cache.get(cache_key)
+    if cached_result:
+        return cached_result
+    
+    points = await summary_service.get_timeseries(db, interval, start_date, end_date, agency, call_type, group_by)
+    result = TimeseriesResponse(interval=interval, group_by=group_by, points=points).model_dump(mode="json")
+    
+    await async_cache.set(cache_key, result, policy.ttl)
+    
+    return result
+
+
+@router.get("/heatmap")
+async def get_heatmap(
+    start_date: Optional[date] = Query(None, description="Start date filter"),
+    end_date: Optional[date] = Query(None, description="End date filter"),
+    call_type: Optional[str] = Query(None, description="Exact call type name"),
+    format: Literal["png", "raw"] = Query("png", description="PNG image or raw little-endian float32 grid"),
+    etag: Optional[str] = Depends(check_etag),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get call density over Johnson County for a date range.
+
+    Sums the precomputed per-day grids, so the cost grows with the number
+    of days rather than the number of calls. Rows run north to south and
+    columns west to east over the bounds in the X-Heatmap-Bounds header.
+    """
+    
+    grid = await heatmap_service.get_grid(db, start_date, end_date, call_type)
+    headers = {
+        "X-Heatmap-Bounds": ",".join(str(v) for v in HEATMAP_BOUNDS),
+        "X-Heatmap-Size": f"{GRID_SIZE},{GRID_SIZE}",
+        # Old days still change when the bulk geocoder runs, so clients revalidate
+        # every time and get a 304 while the data version is unchanged
+        "Cache-Control": "public, no-cache",
+        **(etag_headers(etag) or {}),
+    }
+    
+    if format == "raw":
+        return Response(grid.astype("<f4").tobytes(), media_type="application/octet-stream", headers=headers)
+    return Response(heatmap_service.render_png(grid), media_type="image/png", headers=headers)
+
+
 @router.post("/logs/refresh")
 async def refresh_logs():
     """Trigger logs refresh and clear cache"""
-    cache.clear_pattern("logs:*")
-    cache.clear_pattern("log:*")
+    await async_cache.invalidate(LOGS_NAMESPACE, LOG_NAMESPACE, HISTORY_NAMESPACE)
     
     return {"message": "Cache cleared, logs refresh triggered"}
 
@@ -37,13 +37,86 @@ class JeccLog(JeccLogBase):
         from_attributes = True
 
 
+class NearestLog(JeccLog):
+    distance_m: float
+
+
 class LogsResponse(BaseModel):
     logs: list[JeccLog]
-    total: int
+    total: Optional[int] = None
+    total_estimated: bool = False
     page: int
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class LogChangesResponse(BaseModel):
+    """Logs changed after a watermark, oldest change first"""
+    logs: list[JeccLog]
+    next_token: Optional[str] = None  # pass as since to continue; unchanged when nothing is new
+    has_more: bool
+
+
+class LogBatchRequest(BaseModel):
+    ids: list[int]
+
+
+class LogBatchResponse(BaseModel):
+    """Logs in the order requested; ids with no log are listed in missing"""
+    logs: list[JeccLog]
+    missing: list[int]
+
+
+class MapLogsResponse(BaseModel):
+    """Geocoded logs as parallel arrays; call_type_codes index into call_types"""
+    count: int
+    ids: list[int]
+    lat: list[float]
+    lon: list[float]
+    call_type_codes: list[int]
+    call_types: list[Optional[str]]
+    times: list[Optional[int]]
+
+
+class LogCluster(BaseModel):
+    geohash: str
+    count: int
+    lat: float
+    lon: float
+    log_id: Optional[int] = None  # set when the cluster holds a single log
+
+
+class ClustersResponse(BaseModel):
+    zoom: int
+    precision: int
+    total: int
+    clusters: list[LogCluster]
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    agencies: list[FacetCount]
+    call_types: list[FacetCount]
+    dispositions: list[FacetCount]
+
+
+class TimeseriesPoint(BaseModel):
+    bucket: datetime
+    group: Optional[str] = None
+    count: int
+
+
+class TimeseriesResponse(BaseModel):
+    interval: str
+    group_by: Optional[str] = None
+    points: list[TimeseriesPoint]
 
 
 class HealthResponse(BaseModel):
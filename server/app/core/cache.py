@@ -1,10 +1,24 @@
+import asyncio
+import orjson
 import redis
+import redis.asyncio as aioredis
 import json
-from typing import Optional, Any
+import struct
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Optional, Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Tuple
 from app.core.config import settings
 
+# Sentinel for "not looked up yet" / "no value", since None is a valid cached value
+MISSING = object()
+
 
 class Cache:
+    """Synchronous cache client, used by the scraper and scripts"""
+
     def __init__(self):
         self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
     
@@ -27,7 +41,29 @@ class Cache:
                 ttl, 
                 json.dumps(value, default=str)
             )
-        except (redis.RedisError, json.JSONEncodeError):
+        except (redis.RedisError, TypeError, ValueError):
+            return False
+    
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip; missing keys come back as None"""
+        if not keys:
+            return []
+        try:
+            return [_decode(value) for value in self.redis_client.mget(keys)]
+        except redis.RedisError:
+            return [None] * len(keys)
+    
+    def set_many(self, values: Dict[str, Any], ttl: int = None) -> bool:
+        """Set several values with the same TTL in one pipelined round trip"""
+        if not values:
+            return True
+        try:
+            ttl = ttl or settings.cache_ttl
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.setex(key, ttl, json.dumps(value, default=str))
+            return all(pipe.execute())
+        except (redis.RedisError, TypeError, ValueError):
             return False
     
     def delete(self, key: str) -> bool:
@@ -38,15 +74,630 @@ class Cache:
             return False
     
     def clear_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern"""
+        """Delete all keys matching pattern (incremental SCAN, prefer invalidate())"""
+        try:
+            deleted = 0
+            for key in self.redis_client.scan_iter(match=pattern, count=1000):
+                deleted += self.redis_client.delete(key)
+            return deleted
+        except redis.RedisError:
+            return 0
+    
+    def generation(self, namespace: str) -> int:
+        """Current generation of a cache namespace"""
+        try:
+            return int(self.redis_client.get(generation_key(namespace)) or 0)
+        except redis.RedisError:
+            return 0
+    
+    def namespaced_key(self, namespace: str, key: str) -> str:
+        """Key scoped to the current generation of a namespace"""
+        return versioned_key(namespace, self.generation(namespace), key)
+    
+    def invalidate(self, *namespaces: str) -> bool:
+        """Invalidate every key in the given namespaces, bump the data version and notify API workers"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for namespace in namespaces:
+                pipe.incr(generation_key(namespace))
+            pipe.eval(_BUMP_VERSION, 1, DATA_VERSION_KEY, _now_ms())
+            *generations, version = pipe.execute()
+            pipe = self.redis_client.pipeline(transaction=False)
+            for namespace, generation in zip(namespaces, generations):
+                pipe.publish(INVALIDATION_CHANNEL, _invalidation_message(namespace, generation, version))
+            pipe.execute()
+            return True
+        except redis.RedisError:
+            return False
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU of decoded values with per-entry expiry
+    Bounded both by entry count and by the total size callers report for the
+    entries, which is their serialized size. Entries larger than
+    max_entry_bytes are never held, so large map and list bodies stay in Redis.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, maxbytes: int, max_entry_bytes: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.max_entry_bytes = min(max_entry_bytes, maxbytes)
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: int = None, size: int = 0) -> None:
+        if self.maxsize <= 0 or size > self.max_entry_bytes:
+            # Drop any older copy so it is not served in place of this value
+            self.delete(key)
+            return
+        ttl = min(ttl or self.ttl, self.ttl)
+        self.delete(key)
+        self._entries[key] = (time.monotonic() + ttl, value, size)
+        self.size += size
+        while len(self._entries) > self.maxsize or self.size > self.maxbytes:
+            self.size -= self._entries.popitem(last=False)[1][2]
+    
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+    
+    def clear_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self.delete(key)
+
+
+class AsyncCache:
+    """
+    asyncio cache client for request handlers, backed by a bounded connection pool
+    Reads go through an in-process LocalCache first. While listen() is running,
+    namespace generations are also held locally and kept current from the
+    invalidation channel, so hot keys are served without touching Redis.
+    """
+
+    def __init__(self):
+        # Blocking pools make callers wait briefly for a free connection instead
+        # of failing, which every caller would treat as a miss (or as Redis
+        # being down, skipping the recompute lock)
+        self.pool = aioredis.BlockingConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_pool_size,
+            timeout=settings.redis_pool_timeout,
+            decode_responses=True,
+        )
+        self.redis_client = aioredis.Redis(connection_pool=self.pool)
+        # Entries written by get_or_compute() are binary, so they use their own pool
+        self.raw_pool = aioredis.BlockingConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_pool_size,
+            timeout=settings.redis_pool_timeout,
+        )
+        self.raw_client = aioredis.Redis(connection_pool=self.raw_pool)
+        # Subscriptions hold their connection for the life of the worker, so they
+        # get their own pool rather than taking request connections: one for
+        # listen() and one for the log event hub
+        self.pubsub_pool = aioredis.ConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=2,
+            decode_responses=True,
+        )
+        self.pubsub_client = aioredis.Redis(connection_pool=self.pubsub_pool)
+        self.local = LocalCache(
+            settings.local_cache_size,
+            settings.local_cache_ttl,
+            settings.local_cache_max_bytes,
+            settings.local_cache_max_entry_bytes,
+        )
+        self._generations: Dict[str, int] = {}
+        self._data_version: Optional[int] = None
+        self.invalidated_at = 0.0  # monotonic time of the last invalidation seen
+        self._listening = False
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def ping(self) -> bool:
+        """Check the Redis connection, bypassing the local tier"""
+        try:
+            return bool(await self.redis_client.ping())
+        except redis.RedisError:
+            return False
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache"""
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        try:
+            data = await self.redis_client.get(key)
+        except redis.RedisError:
+            return None
+        value = _decode(data)
+        if value is not None:
+            self.local.set(key, value, size=len(data))
+        return value
+    
+    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+        """Set value in cache with optional TTL"""
+        try:
+            ttl = ttl or settings.cache_ttl
+            data = json.dumps(value, default=str)
+            stored = await self.redis_client.setex(key, ttl, data)
+        except (redis.RedisError, TypeError, ValueError):
+            return False
+        self.local.set(key, value, ttl, len(data))
+        return stored
+    
+    async def get_many(self, keys: List[str], local: bool = True) -> List[Optional[Any]]:
+        """
+        Get several values in one round trip; missing keys come back as None
+        With local=False the local tier is neither read nor filled, so large
+        batches of per-row entries don't evict the hot keys it holds.
+        """
+        values = [self.local.get(key) if local else None for key in keys]
+        missing = [key for key, value in zip(keys, values) if value is None]
+        if not missing:
+            return values
+        try:
+            raw = dict(zip(missing, await self.redis_client.mget(missing)))
+        except redis.RedisError:
+            return values
+        fetched = {key: _decode(data) for key, data in raw.items()}
+        if local:
+            for key, value in fetched.items():
+                if value is not None:
+                    self.local.set(key, value, size=len(raw[key]))
+        return [fetched.get(key) if value is None else value for key, value in zip(keys, values)]
+    
+    async def set_many(self, values: Dict[str, Any], ttl: int = None, local: bool = True) -> bool:
+        """Set several values with the same TTL in one pipelined round trip"""
+        if not values:
+            return True
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
+            ttl = ttl or settings.cache_ttl
+            encoded = {key: json.dumps(value, default=str) for key, value in values.items()}
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, data in encoded.items():
+                    pipe.setex(key, ttl, data)
+                stored = all(await pipe.execute())
+        except (redis.RedisError, TypeError, ValueError):
+            return False
+        if local:
+            for key, value in values.items():
+                self.local.set(key, value, ttl, len(encoded[key]))
+        return stored
+    
+    async def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        self.local.delete(key)
+        try:
+            return bool(await self.redis_client.delete(key))
+        except redis.RedisError:
+            return False
+    
+    async def clear_pattern(self, pattern: str) -> int:
+        """Delete all keys matching pattern (incremental SCAN, prefer invalidate())"""
+        try:
+            deleted = 0
+            async for key in self.redis_client.scan_iter(match=pattern, count=1000):
+                self.local.delete(key)
+                deleted += await self.redis_client.delete(key)
+            return deleted
+        except redis.RedisError:
             return 0
+    
+    async def generation(self, namespace: str) -> int:
+        """Current generation of a cache namespace"""
+        if self._listening and namespace in self._generations:
+            return self._generations[namespace]
+        try:
+            generation = int(await self.redis_client.get(generation_key(namespace)) or 0)
         except redis.RedisError:
             return 0
+        if self._listening:
+            # A newer generation may have been published while we were reading
+            generation = max(generation, self._generations.get(namespace, generation))
+            self._generations[namespace] = generation
+        return generation
+    
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        """Key scoped to the current generation of a namespace"""
+        return versioned_key(namespace, await self.generation(namespace), key)
+    
+    async def data_version(self) -> Optional[int]:
+        """
+        Version of the log data, bumped by every invalidation
+        Served from memory while listen() is running; None if Redis is unavailable
+        """
+        if self._listening and self._data_version is not None:
+            return self._data_version
+        try:
+            version = int(await self.redis_client.get(DATA_VERSION_KEY) or 0)
+        except redis.RedisError:
+            return None
+        if self._listening:
+            version = max(version, self._data_version or 0)
+            self._data_version = version
+        return version
+    
+    async def invalidate(self, *namespaces: str) -> bool:
+        """Invalidate every key in the given namespaces, bump the data version and notify other workers"""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for namespace in namespaces:
+                    pipe.incr(generation_key(namespace))
+                pipe.eval(_BUMP_VERSION, 1, DATA_VERSION_KEY, _now_ms())
+                *generations, version = await pipe.execute()
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for namespace, generation in zip(namespaces, generations):
+                    self._apply_invalidation(namespace, generation, version)
+                    pipe.publish(INVALIDATION_CHANNEL, _invalidation_message(namespace, generation, version))
+                await pipe.execute()
+            return True
+        except redis.RedisError:
+            return False
+    
+    async def get_entry(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Read a (fresh_until, value) entry written by get_or_compute()"""
+        return (await self.get_entries([key]))[0]
+    
+    async def get_entries(self, keys: List[str]) -> List[Optional[Tuple[float, Any]]]:
+        """Read several get_or_compute() entries in one round trip"""
+        entries = [self.local.get(key) for key in keys]
+        missing = [key for key, entry in zip(keys, entries) if entry is None]
+        if not missing:
+            return entries
+        try:
+            raw = dict(zip(missing, await self.raw_client.mget(missing)))
+        except redis.RedisError:
+            return entries
+        fetched = {key: unpack_entry(data) for key, data in raw.items()}
+        for key, entry in fetched.items():
+            if entry is not None:
+                self.local.set(key, entry, size=entry_size(raw[key], entry))
+        return [fetched.get(key) if entry is None else entry for key, entry in zip(keys, entries)]
+    
+    async def set_entry(self, key: str, value: Any, soft_ttl: int = None, ttl: int = None) -> bool:
+        """Store a value with a soft expiry; bytes values are stored and returned verbatim"""
+        entry = (time.time() + (soft_ttl or settings.cache_soft_ttl), value)
+        try:
+            ttl = ttl or settings.cache_ttl
+            data = pack_entry(*entry)
+            stored = await self.raw_client.setex(key, ttl, data)
+        except (redis.RedisError, TypeError):
+            return False
+        self.local.set(key, entry, ttl, entry_size(data, entry))
+        return stored
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = None,
+        soft_ttl: int = None,
+        stale_key: Optional[str] = None,
+        cached: Any = MISSING,
+        on_stale: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Read a value stored with a soft TTL, computing it at most once at a time
+        
+        Past its soft TTL an entry is still served to everyone except the one
+        caller that wins the refresh lock and recomputes it. On a miss, callers
+        in this worker share one in-flight computation and callers in other
+        workers wait for the lock holder, or are served stale_key (typically
+        the same key under the previous generation) if it is still cached.
+        The lock winner re-reads the key from Redis first, so a stale local
+        copy does not trigger a recompute another worker has just finished.
+        cached is an entry already fetched with get_entries(), to save a read.
+        on_stale is called when the stale_key value is served, since it may
+        predate the invalidation that orphaned key.
+        """
+        if cached is MISSING:
+            cached = await self.get_entry(key)
+        if cached is not None:
+            fresh_until, value = cached
+            if fresh_until > time.time():
+                return value
+            token = await self._lock(key)
+            if token is None:
+                return value
+            return await self._compute(key, compute, ttl, soft_ttl, token)
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            value, stale = await asyncio.shield(inflight)
+            if value is not MISSING:
+                if stale and on_stale:
+                    on_stale()
+                return value
+            return await compute()
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        value, stale = MISSING, False
+        try:
+            token = await self._lock(key)
+            if token is None:
+                value, stale = await self._wait_for(key, stale_key)
+            if value is MISSING:
+                value = await self._compute(key, compute, ttl, soft_ttl, token)
+            elif stale and on_stale:
+                on_stale()
+            return value
+        finally:
+            # Waiters fall back to computing themselves if this caller failed
+            future.set_result((value, stale))
+            del self._inflight[key]
+    
+    async def _fresh(self, key: str) -> Any:
+        """
+        Value of key if Redis holds a fresh entry for it, or MISSING
+        Reads past the local tier, which may still hold an entry another
+        worker has since refreshed.
+        """
+        try:
+            data = await self.raw_client.get(key)
+        except redis.RedisError:
+            return MISSING
+        entry = unpack_entry(data)
+        if entry is None or entry[0] <= time.time():
+            return MISSING
+        self.local.set(key, entry, size=entry_size(data, entry))
+        return entry[1]
+    
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int,
+                       soft_ttl: int, token: Optional[str]) -> Any:
+        if token is not None:
+            # The previous lock holder may have refreshed key already
+            value = await self._fresh(key)
+            if value is not MISSING:
+                await self._unlock(key, token)
+                return value
+        try:
+            value = await compute()
+            await self.set_entry(key, value, soft_ttl, ttl)
+            return value
+        finally:
+            if token is not None:
+                await self._unlock(key, token)
+    
+    async def _lock(self, key: str) -> Optional[str]:
+        """Take the recompute lock for a key; returns its token, or None if held elsewhere"""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis_client.set(
+                lock_key(key), token, nx=True, px=int(settings.cache_lock_timeout * 1000)
+            )
+        except redis.RedisError:
+            # Without Redis there is nothing to coordinate on; just compute
+            return token
+        return token if acquired else None
+    
+    async def _unlock(self, key: str, token: str) -> None:
+        try:
+            await self.redis_client.eval(_RELEASE_LOCK, 1, lock_key(key), token)
+        except redis.RedisError:
+            pass
+    
+    async def _wait_for(self, key: str, stale_key: Optional[str]) -> Tuple[Any, bool]:
+        """
+        Value to serve while another worker computes key, or MISSING on timeout,
+        and whether it was read from stale_key
+        """
+        if stale_key:
+            stale = await self.get_entry(stale_key)
+            if stale is not None:
+                return stale[1], True
+        deadline = time.monotonic() + settings.cache_lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            try:
+                data = await self.raw_client.get(key)
+            except redis.RedisError:
+                return MISSING, False
+            entry = unpack_entry(data)
+            if entry is not None:
+                self.local.set(key, entry, size=entry_size(data, entry))
+                return entry[1], False
+        return MISSING, False
+    
+    async def listen(self) -> None:
+        """
+        Follow the invalidation channel until cancelled, reconnecting on errors
+        Run as a background task for the lifetime of each API worker
+        """
+        while True:
+            pubsub = self.pubsub_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._listening = True
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        payload = json.loads(message["data"])
+                        self._apply_invalidation(
+                            payload["namespace"], int(payload["generation"]), int(payload["version"])
+                        )
+                    except (KeyError, TypeError, ValueError):
+                        continue
+            except redis.RedisError:
+                # Messages may have been missed; fall back to reading generations from Redis
+                self._listening = False
+                self._generations.clear()
+                self._data_version = None
+                await asyncio.sleep(1)
+            finally:
+                self._listening = False
+                await pubsub.close()
+    
+    def _apply_invalidation(self, namespace: str, generation: int, version: int) -> None:
+        if generation > self._generations.get(namespace, -1):
+            self._generations[namespace] = generation
+        if version > (self._data_version or -1):
+            self._data_version = version
+        self.invalidated_at = time.monotonic()
+        self.local.clear_prefix(f"{namespace}:")
+    
+    async def close(self) -> None:
+        """Release pooled connections"""
+        await self.pool.disconnect()
+        await self.raw_pool.disconnect()
+        await self.pubsub_pool.disconnect()
+
+
+# Namespaces for derived log data (lists, counts, map and aggregates) and single logs
+LOGS_NAMESPACE = "logs"
+LOG_NAMESPACE = "log"
+# Derived data for date ranges that lie entirely within finalized days; only
+# writes that touch those days invalidate it
+HISTORY_NAMESPACE = "history"
+
+# Pub/sub channel announcing namespace generation bumps to every API worker
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Monotonic version of the log data, used for HTTP ETags. Each bump takes at
+# least the current time in milliseconds, so versions keep increasing even if
+# Redis loses the key.
+DATA_VERSION_KEY = "data:version"
+
+_BUMP_VERSION = """
+local version = math.max((tonumber(redis.call("get", KEYS[1])) or 0) + 1, tonumber(ARGV[1]))
+redis.call("set", KEYS[1], version)
+return version
+"""
+
+# How often a worker waiting on another worker's recompute checks for the result
+LOCK_POLL_INTERVAL = 0.05
+
+# Delete a lock only if it is still the one we took
+_RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class CachePolicy(NamedTuple):
+    namespace: str
+    ttl: int
+    soft_ttl: Optional[int]
+
+
+def is_finalized(day: date) -> bool:
+    """Whether JECC is done revising the logs of a day"""
+    return day < date.today() - timedelta(days=settings.live_window_days)
+
+
+def range_policy(start_date: Optional[date], end_date: Optional[date]) -> CachePolicy:
+    """
+    Namespace and TTLs for data derived from logs between two dates
+    An open-ended range always includes the live window
+    """
+    if end_date is not None and is_finalized(end_date):
+        return CachePolicy(HISTORY_NAMESPACE, settings.history_cache_ttl, settings.history_cache_ttl)
+    return CachePolicy(LOGS_NAMESPACE, settings.live_cache_ttl, None)
+
+
+def namespaces_for_days(days: Iterable[date]) -> Tuple[str, ...]:
+    """Namespaces to invalidate after writing logs dated on the given days"""
+    if any(is_finalized(day) for day in days):
+        return LOGS_NAMESPACE, LOG_NAMESPACE, HISTORY_NAMESPACE
+    return LOGS_NAMESPACE, LOG_NAMESPACE
+
+
+def generation_key(namespace: str) -> str:
+    return f"gen:{namespace}"
+
+
+def versioned_key(namespace: str, generation: int, key: str) -> str:
+    """
+    Build a key that embeds its namespace's generation
+    Bumping the generation orphans every older key at once; they age out by TTL
+    """
+    return f"{namespace}:{generation}:{key}"
+
+
+def lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+# get_or_compute() entry header: soft expiry (unix time) and flags
+_ENTRY_HEADER = struct.Struct(">dB")
+_ENTRY_RAW = 1
+_ENTRY_COMPRESSED = 2
+
+
+def pack_entry(fresh_until: float, value: Any) -> bytes:
+    """
+    Serialize a soft-TTL entry
+    bytes values (pre-rendered response bodies) are kept as-is, anything else
+    is encoded with orjson. Payloads past cache_compress_min_bytes are zlib
+    compressed.
+    """
+    flags = 0
+    if isinstance(value, bytes):
+        payload, flags = value, _ENTRY_RAW
+    else:
+        payload = orjson.dumps(value, default=str)
+    if settings.cache_compress_min_bytes and len(payload) >= settings.cache_compress_min_bytes:
+        payload, flags = zlib.compress(payload, 1), flags | _ENTRY_COMPRESSED
+    return _ENTRY_HEADER.pack(fresh_until, flags) + payload
+
+
+def unpack_entry(data: Optional[bytes]) -> Optional[Tuple[float, Any]]:
+    """Inverse of pack_entry(); None for missing or unreadable entries"""
+    if not data or len(data) < _ENTRY_HEADER.size:
+        return None
+    try:
+        fresh_until, flags = _ENTRY_HEADER.unpack_from(data)
+        payload = data[_ENTRY_HEADER.size:]
+        if flags & _ENTRY_COMPRESSED:
+            payload = zlib.decompress(payload)
+        return fresh_until, payload if flags & _ENTRY_RAW else orjson.loads(payload)
+    except (struct.error, zlib.error, orjson.JSONDecodeError):
+        return None
+
+
+def entry_size(data: bytes, entry: Tuple[float, Any]) -> int:
+    """
+    Size of a get_or_compute() entry for the local tier
+    Pre-rendered bodies count at their uncompressed length, which is what the
+    local tier holds; other values count at their stored size.
+    """
+    return len(entry[1]) if isinstance(entry[1], bytes) else len(data)
+
+
+def _invalidation_message(namespace: str, generation: int, version: int) -> str:
+    return json.dumps({"namespace": namespace, "generation": generation, "version": version})
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _decode(value: Optional[str]) -> Optional[Any]:
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return None
 
 
-# Global cache instance
-cache = Cache()
\ No newline at end of file
+# Global cache instances
+cache = Cache()
+async_cache = AsyncCache()
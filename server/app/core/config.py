@@ -1,5 +1,6 @@
+import os
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -9,16 +10,37 @@ class Settings(BaseSettings):
     database_host: str = "localhost"
     database_port: int = 5432
     database_name: str = "tiffin_times"
+    database_max_connections: int = 80  # budget shared by all API workers
+    database_max_overflow: int = 2  # extra connections per engine under bursts
+    
+    # Read replicas ("host" or "host:port", same credentials and database name).
+    # API reads and analysis queries go to a replica whose replay lag is within
+    # replica_max_lag; otherwise they fall back to the primary.
+    database_replica_hosts: List[str] = []
+    replica_max_lag: float = 10.0  # seconds
+    replica_check_interval: float = 5.0  # seconds between lag checks per replica
     
     # Redis
     redis_url: str = "redis://localhost:6379"
+    redis_max_connections: int = 200  # budget shared by all API workers
+    redis_pool_timeout: float = 1.0  # seconds to wait for a free pooled connection
     
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     
+    # Production serving (gunicorn.conf.py)
+    web_workers: int = 0  # 0 = one per CPU core
+    web_preload: bool = True  # import the app once in the master before forking
+    # GET requests replayed by each worker at startup to fill the caches
+    warm_paths: List[str] = ["/api/v1/logs", "/api/v1/facets", "/api/v1/logs/map"]
+    
     # JECC
     jecc_url: str = "http://www.jecc-ema.org/jecc/jecccfs.php"
+    # Politeness limits for date-range scrapes
+    scrape_concurrency: int = 4  # days fetched in parallel (max requests in flight)
+    scrape_min_interval: float = 0.5  # seconds between request starts
+    scrape_queue_size: int = 8  # parsed days waiting for the database writer
     
     # Geocoding
     geocoding_service: str = "nominatim"
@@ -27,12 +49,78 @@ class Settings(BaseSettings):
     # Cache TTL (seconds)
     cache_ttl: int = 3600  # 1 hour
     
+    # Age-aware TTLs for date-filtered queries (seconds). Logs older than
+    # live_window_days stop changing, so queries that end before then are
+    # cached for a long time and survive routine invalidations.
+    live_window_days: int = 2
+    live_cache_ttl: int = 600  # 10 minutes, for queries that reach into the live window
+    history_cache_ttl: int = 604800  # 1 week
+    
+    # In-process cache tier in front of Redis (per API worker)
+    local_cache_size: int = 1024  # entries; 0 disables
+    local_cache_ttl: int = 30  # upper bound on staleness if an invalidation is missed
+    local_cache_max_bytes: int = 64 * 1024 * 1024  # serialized size of all entries
+    local_cache_max_entry_bytes: int = 256 * 1024  # larger values are only cached in Redis
+    
+    # Stale-while-revalidate for expensive queries (seconds)
+    cache_soft_ttl: int = 300  # entries older than this are refreshed by one caller
+    cache_lock_timeout: float = 10.0  # longest a recompute lock is held
+    cache_compress_min_bytes: int = 4096  # zlib-compress larger entries; 0 disables
+    
+    # Ordered ids cached per /logs filter set; pages inside it skip the sorted query
+    result_window_size: int = 10000
+    
+    # /logs/changes only reports rows older than this many seconds, so writes
+    # still committing with an earlier updated_at are not skipped by a watermark
+    changes_settle_seconds: int = 30
+    
+    # Live log events (/logs/stream)
+    event_queue_size: int = 256  # events buffered per client before it is disconnected
+    event_keepalive: float = 15.0  # seconds between keepalive comments
+    event_retry_ms: int = 3000  # client reconnect delay
+    
     class Config:
         env_file = ".env"
 
+    @property
+    def worker_count(self) -> int:
+        return self.web_workers or os.cpu_count() or 1
+
+    @property
+    def db_engine_connections(self) -> int:
+        """Most connections one engine may open; each worker has a sync and an async engine"""
+        return max(1, self.database_max_connections // (2 * self.worker_count))
+
+    @property
+    def db_pool_size(self) -> int:
+        """Connections kept per engine, leaving room for db_max_overflow"""
+        return max(1, self.db_engine_connections - self.database_max_overflow)
+
+    @property
+    def db_max_overflow(self) -> int:
+        """Burst connections per engine, trimmed so pool plus overflow stays in budget"""
+        return max(0, min(self.database_max_overflow, self.db_engine_connections - self.db_pool_size))
+
+    @property
+    def redis_pool_size(self) -> int:
+        """
+        Connections per Redis pool; each worker has two, plus one pub/sub
+        connection each for cache invalidations and log events
+        """
+        per_worker = self.redis_max_connections // self.worker_count
+        return max(2, (per_worker - 2) // 2)
+
     @property
     def database_url(self) -> str:
         return f"postgresql://{self.database_user}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
 
+    @property
+    def async_database_url(self) -> str:
+        return f"postgresql+asyncpg://{self.database_user}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
+
+    def replica_url(self, host: str, driver: str = "postgresql") -> str:
+        host, _, port = host.partition(":")
+        return f"{driver}://{self.database_user}:{self.database_password}@{host}:{port or self.database_port}/{self.database_name}"
+
 
 settings = Settings()
\ No newline at end of file
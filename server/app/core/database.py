@@ -1,9 +1,18 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import time
+from typing import List, Optional
+
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from app.core.cache import async_cache
 from app.core.config import settings
 
 engine = create_engine(
     settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
     pool_pre_ping=True,
     pool_recycle=300,
     echo=False,
@@ -11,6 +20,162 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# asyncpg engine for request handlers, so database I/O doesn't block the event loop
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    echo=False,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Seconds a replica is behind the primary; 0 when it has replayed everything it
+# received, or when it is not a standby at all (e.g. a second local instance).
+# NULL (unusable) when the standby isn't streaming from the primary, since it
+# then has nothing left to replay however far behind it is. status is only
+# visible to roles with pg_read_all_stats; otherwise a running receiver counts.
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE COALESCE(status, 'streaming') = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    """Sync and async engines for one read replica, with its last measured lag"""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.engine = create_engine(
+            settings.replica_url(host),
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=300,
+            # Don't let an unreachable replica stall the lag check for long
+            connect_args={"connect_timeout": max(1, int(settings.replica_check_interval))},
+        )
+        self.async_engine = create_async_engine(
+            settings.replica_url(host, "postgresql+asyncpg"),
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=300,
+        )
+        self.lag: Optional[float] = None  # None until measured, or after a failed check
+        self.checked_at = 0.0
+        self.checking = False
+
+    @property
+    def due(self) -> bool:
+        return not self.checking and time.monotonic() - self.checked_at >= settings.replica_check_interval
+
+    @property
+    def usable(self) -> bool:
+        return self.lag is not None and self.lag <= settings.replica_max_lag
+
+    def _record(self, lag: Optional[float]) -> None:
+        self.lag = None if lag is None else float(lag)
+        self.checked_at = time.monotonic()
+        self.checking = False
+
+    def check(self) -> None:
+        self.checking = True
+        try:
+            with self.engine.connect() as conn:
+                lag = conn.scalar(REPLICA_LAG_QUERY)
+        except Exception:
+            lag = None
+        self._record(lag)
+
+    async def _measure(self) -> float:
+        async with self.async_engine.connect() as conn:
+            return await conn.scalar(REPLICA_LAG_QUERY)
+
+    async def check_async(self) -> None:
+        self.checking = True
+        try:
+            lag = await asyncio.wait_for(self._measure(), settings.replica_check_interval)
+        except Exception:
+            lag = None
+        self._record(lag)
+
+
+class ReplicaRouter:
+    """
+    Chooses the engine for read-only sessions
+    Replicas take turns while their lag is within replica_max_lag. In API
+    workers lag is measured every replica_check_interval by monitor(), a
+    background task, so choosing an engine never waits on a replica. Other
+    processes (scripts) measure it on demand instead. With no usable
+    replica, reads go to the primary.
+    
+    For replica_max_lag seconds after a cache invalidation every read goes
+    to the primary, so results recomputed for the new cache generation
+    cannot come from a replica that has not replayed the write yet.
+    """
+
+    def __init__(self, hosts: List[str]):
+        self.replicas = [Replica(host) for host in hosts]
+        self._turn = itertools.count()
+        self.monitoring = False
+
+    def _pick(self) -> Optional[Replica]:
+        if time.monotonic() - async_cache.invalidated_at < settings.replica_max_lag:
+            return None
+        usable = [replica for replica in self.replicas if replica.usable]
+        if not usable:
+            return None
+        return usable[next(self._turn) % len(usable)]
+
+    async def monitor(self) -> None:
+        """
+        Measure every replica's lag until cancelled
+        Run as a background task for the lifetime of each API worker
+        """
+        if not self.replicas:
+            return
+        self.monitoring = True
+        try:
+            while True:
+                await asyncio.gather(*(replica.check_async() for replica in self.replicas))
+                await asyncio.sleep(settings.replica_check_interval)
+        finally:
+            self.monitoring = False
+
+    def read_engine(self) -> Engine:
+        if not self.monitoring:
+            for replica in self.replicas:
+                if replica.due:
+                    replica.check()
+        replica = self._pick()
+        return replica.engine if replica else engine
+
+    def async_read_engine(self) -> AsyncEngine:
+        replica = self._pick()
+        return replica.async_engine if replica else async_engine
+
+
+replica_router = ReplicaRouter(settings.database_replica_hosts)
+
+
+def ReadSessionLocal():
+    """Session for read-only work, bound to a replica when one is usable"""
+    return SessionLocal(bind=replica_router.read_engine())
+
+
+def AsyncReadSessionLocal() -> AsyncSession:
+    """Async session for read-only work, bound to a replica when one is usable"""
+    return AsyncSessionLocal(bind=replica_router.async_read_engine())
+
 
 def get_db():
     """Database dependency for FastAPI"""
@@ -18,4 +183,25 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db():
+    """Read-only database dependency for FastAPI; may be served by a replica"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Async database dependency for FastAPI"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """Async read-only database dependency for FastAPI; may be served by a replica"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
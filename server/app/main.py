@@ -1,12 +1,94 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 from app.api.v1.routes import router as api_v1_router
+from app.core.cache import async_cache
+from app.core.database import engine, async_engine, replica_router
+from app.services.events import event_hub
 from app.core.config import settings
 
+
+def _connect_sync() -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def _connect_async() -> None:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _get(app: FastAPI, path: str) -> int:
+    """Run a GET through the full ASGI stack in-process and return its status"""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [], "client": None, "server": None,
+    }
+    status = 0
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+    
+    await app(scope, receive, send)
+    return status
+
+
+async def warm_up(app: FastAPI) -> None:
+    """
+    Fill this worker's connection pools and caches before it takes traffic
+    Failures are reported but never stop the worker from starting
+    """
+    results = await asyncio.gather(
+        *(_connect_async() for _ in range(settings.db_pool_size)),
+        *(asyncio.to_thread(_connect_sync) for _ in range(settings.db_pool_size)),
+        return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        print(f"Database warm-up failed: {errors[0]}")
+        return
+    
+    for path in settings.warm_paths:
+        try:
+            print(f"Warmed {path}: {await _get(app, path)}")
+        except Exception as e:
+            print(f"Warming {path} failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep this worker's in-process cache tier in step with invalidations,
+    # relay log events to its /logs/stream clients and track replica lag
+    tasks = [
+        asyncio.create_task(async_cache.listen()),
+        asyncio.create_task(event_hub.run()),
+        asyncio.create_task(replica_router.monitor()),
+    ]
+    await warm_up(app)
+    yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    await async_cache.close()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="Tiffin Times API",
     description="API for emergency call logs from JECC",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -28,5 +110,6 @@ async def root():
 
 
 if __name__ == "__main__":
+    # Single-process development server; production runs gunicorn.conf.py
     import uvicorn
     uvicorn.run(app, host=settings.api_host, port=settings.api_port)
\ No newline at end of file
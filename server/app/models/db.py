@@ -1,9 +1,46 @@
-from sqlalchemy import Column, Integer, String, Date, Time, Text, Numeric, DateTime
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, Date, Time, Text, Numeric, DateTime, LargeBinary,
+    Index, Computed, ForeignKey, text
+)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
+from sqlalchemy.types import UserDefinedType
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# cos(41.6°): shrinks longitude to the length of a degree of latitude in
+# Johnson County, so distances between scaled points are isotropic there
+LONGITUDE_SCALE = 0.747798
+
+
+class Point(UserDefinedType):
+    """Native Postgres point type, stored as (longitude, latitude)"""
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "POINT"
+
+
+class Agency(Base):
+    __tablename__ = "agencies"
+
+    id = Column(SmallInteger, primary_key=True)
+    name = Column(Text, nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<Agency(id={self.id}, name='{self.name}')>"
+
+
+class CallType(Base):
+    __tablename__ = "call_types"
+
+    id = Column(SmallInteger, primary_key=True)
+    name = Column(Text, nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<CallType(id={self.id}, name='{self.name}')>"
+
 
 class JeccLog(Base):
     __tablename__ = "jecc_logs"
@@ -19,15 +56,96 @@ class JeccLog(Base):
     disposition = Column(Text, nullable=True)
     incident_number = Column(Text, nullable=True)
     
+    # Normalized lookups for exact-match filtering
+    agency_id = Column(SmallInteger, ForeignKey("agencies.id"), nullable=True, index=True)
+    call_type_id = Column(SmallInteger, ForeignKey("call_types.id"), nullable=True, index=True)
+    
     # New columns for geocoding
     latitude = Column(Numeric(10, 8), nullable=True)
     longitude = Column(Numeric(11, 8), nullable=True)
     geocoded_at = Column(DateTime(timezone=True), nullable=True)
     geocoded_address = Column(Text, nullable=True)
+    geohash = Column(String(12), nullable=True, index=True)
+    # Derived from longitude/latitude by Postgres; backs bbox/radius/nearest queries
+    location = deferred(Column(
+        Point,
+        Computed("point(longitude::float8, latitude::float8)", persisted=True),
+        nullable=True,
+    ))
+    # Same point with longitude scaled by LONGITUDE_SCALE; backs nearest-neighbour scans
+    location_scaled = deferred(Column(
+        Point,
+        Computed(f"point(longitude::float8 * {LONGITUDE_SCALE}, latitude::float8)", persisted=True),
+        nullable=True,
+    ))
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Matches the list ordering so keyset pagination can seek instead of offset
+        Index(
+            "ix_jecc_logs_sort_key",
+            log_date.desc(),
+            func.coalesce(log_time, text("'24:00:00'::time")).desc(),
+            id.desc(),
+        ),
+        Index("ix_jecc_logs_location", "location", postgresql_using="gist"),
+        Index("ix_jecc_logs_location_scaled", "location_scaled", postgresql_using="gist"),
+        # Watermark scans for /logs/changes
+        Index("ix_jecc_logs_updated_at_id", updated_at, id),
+        # Trigram indexes let substring ILIKE filters use an index
+        Index(
+            "ix_jecc_logs_agency_trgm", agency,
+            postgresql_using="gin", postgresql_ops={"agency": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_jecc_logs_call_type_trgm", call_type,
+            postgresql_using="gin", postgresql_ops={"call_type": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self):
-        return f"<JeccLog(id={self.id}, cfs_number={self.cfs_number}, address='{self.address}')>"
\ No newline at end of file
+        return f"<JeccLog(id={self.id}, cfs_number={self.cfs_number}, address='{self.address}')>"
+
+
+class LogFacetDaily(Base):
+    """Per-day counts of each agency, call type and disposition value"""
+    __tablename__ = "log_facets_daily"
+
+    log_date = Column(Date, primary_key=True)
+    dimension = Column(String(16), primary_key=True)
+    value = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class LogCountDaily(Base):
+    """Calls per day by agency and call type ('' when unknown)"""
+    __tablename__ = "log_counts_daily"
+
+    log_date = Column(Date, primary_key=True)
+    agency = Column(Text, primary_key=True)
+    call_type = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class LogCountHourly(Base):
+    """Calls per hour by agency and call type; logs without a time are not counted"""
+    __tablename__ = "log_counts_hourly"
+
+    log_date = Column(Date, primary_key=True)
+    hour = Column(SmallInteger, primary_key=True)
+    agency = Column(Text, primary_key=True)
+    call_type = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class HeatmapGridDaily(Base):
+    """Sparse per-day density grid over the heatmap bounds; call_type '' holds all types"""
+    __tablename__ = "heatmap_grids_daily"
+
+    log_date = Column(Date, primary_key=True)
+    call_type = Column(Text, primary_key=True)
+    count = Column(Integer, nullable=False)
+    cells = Column(LargeBinary, nullable=False)
@@ -1,7 +1,11 @@
+import queue
+import threading
+import time
 import requests
 import bs4
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -9,16 +13,52 @@ from app.core.database import SessionLocal
 from app.core.config import settings
 from app.models.db import JeccLog
 from app.services.geocode import geocoding_service
-from app.core.cache import cache
+from app.services.logs import logs_service, CHANGE_TIMESTAMP
+from app.services.dimensions import dimension_service
+from app.services.summaries import summary_service
+from app.services.heatmap import heatmap_service
+from app.services.events import event_service, INSERTED, UPDATED, GEOCODED
+from app.core.cache import cache, namespaces_for_days, LOGS_NAMESPACE, HISTORY_NAMESPACE
+
+
+# How often a fetcher waiting on the full parsed-day queue checks whether the run has stopped
+QUEUE_POLL_INTERVAL = 0.5
+
+
+class RateLimiter:
+    """Spaces request starts at least min_interval seconds apart across threads"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
 
 
 class JeccScraper:
     def __init__(self):
         self.jecc_url = settings.jecc_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'TiffinTimes/1.0 (emergency-logs-scraper)'
-        })
+        self.rate_limiter = RateLimiter(settings.scrape_min_interval)
+        # requests.Session isn't thread-safe, so each fetch thread gets its own
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'TiffinTimes/1.0 (emergency-logs-scraper)'
+            })
+            self._local.session = session
+        return session
 
     def fetch_jecc_logs(self, selected_date: datetime, selected_agency: str = "All") -> str:
         """Fetch logs from JECC for a given date and agency."""
@@ -29,6 +69,7 @@ class JeccScraper:
         }
         
         try:
+            self.rate_limiter.wait()
             response = self.session.post(self.jecc_url, data=data, timeout=30)
             response.raise_for_status()
             return response.text
@@ -129,8 +170,12 @@ class JeccScraper:
 
         db = SessionLocal()
         inserted_count = 0
+        inserted_logs, updated_logs = [], []
         
         try:
+            agency_ids = dimension_service.agency_ids(log.get("Agency") for log in logs_data)
+            call_type_ids = dimension_service.call_type_ids(log.get("Call Type") for log in logs_data)
+            
             for log_data in logs_data:
                 if not log_data.get("CFS #"):
                     continue
@@ -148,9 +193,14 @@ class JeccScraper:
                     existing_log.log_time = log_data.get("Time")
                     existing_log.apt_suite = log_data.get("Apt/Suite")
                     existing_log.agency = log_data.get("Agency")
+                    existing_log.agency_id = agency_ids.get(log_data.get("Agency"))
+                    existing_log.call_type_id = call_type_ids.get(log_data.get("Call Type"))
                     existing_log.disposition = log_data.get("Disposition")
                     existing_log.incident_number = log_data.get("Incident #")
-                    existing_log.updated_at = datetime.utcnow()
+                    # Rescrapes mostly return unchanged rows; only touch real changes
+                    if db.is_modified(existing_log):
+                        existing_log.updated_at = CHANGE_TIMESTAMP
+                        updated_logs.append(existing_log)
                 else:
                     # Create new log
                     new_log = JeccLog(
@@ -161,8 +211,11 @@ class JeccScraper:
                         log_time=log_data.get("Time"),
                         apt_suite=log_data.get("Apt/Suite"),
                         agency=log_data.get("Agency"),
+                        agency_id=agency_ids.get(log_data.get("Agency")),
+                        call_type_id=call_type_ids.get(log_data.get("Call Type")),
                         disposition=log_data.get("Disposition"),
-                        incident_number=log_data.get("Incident #")
+                        incident_number=log_data.get("Incident #"),
+                        updated_at=CHANGE_TIMESTAMP
                     )
                     
                     # Check if we already have geocoding for this address
@@ -174,20 +227,33 @@ class JeccScraper:
                         
                         if existing_geocoded:
                             # Copy geocoding data from existing record
-                            new_log.latitude = existing_geocoded.latitude
-                            new_log.longitude = existing_geocoded.longitude
-                            new_log.geocoded_address = existing_geocoded.geocoded_address
-                            new_log.geocoded_at = datetime.utcnow()
+                            logs_service.apply_geocode(
+                                new_log,
+                                existing_geocoded.latitude,
+                                existing_geocoded.longitude,
+                                existing_geocoded.geocoded_address
+                            )
                             print(f"   ✓ Reused geocoding for: {new_log.address}")
                     
                     db.add(new_log)
+                    inserted_logs.append(new_log)
                     inserted_count += 1
 
+            db.flush()
+            inserted_ids = [log.id for log in inserted_logs]
+            updated_ids = [log.id for log in updated_logs]
+            summary_service.refresh_day(db, log_date.date())
+            heatmap_service.refresh_days(db, [log_date.date()])
             db.commit()
             print(f"Processed {len(logs_data)} logs for {log_date.strftime('%m/%d/%Y')} ({inserted_count} new)")
             
-            # Clear cache after updating data
-            cache.clear_pattern("logs:*")
+            # Invalidate cached lists and updated logs and push the changes to
+            # connected dashboards, unless the rescrape changed nothing: routine
+            # rescrapes of finalized days must not reset their caches and ETags
+            if inserted_ids or updated_ids:
+                cache.invalidate(*namespaces_for_days([log_date.date()]))
+                event_service.publish_logs(db, INSERTED, inserted_ids)
+                event_service.publish_logs(db, UPDATED, updated_ids)
             
             return inserted_count
             
@@ -221,20 +287,22 @@ class JeccScraper:
                 
                 if geocode_result:
                     lat, lon, formatted_address = geocode_result
-                    log.latitude = lat
-                    log.longitude = lon
-                    log.geocoded_address = formatted_address
-                    log.geocoded_at = datetime.utcnow()
+                    logs_service.apply_geocode(log, lat, lon, formatted_address)
                     geocoded_count += 1
                     print(f"✓ Geocoded: {lat}, {lon}")
                 else:
                     print(f"✗ Failed to geocode: {log.address}")
             
             if geocoded_count > 0:
+                db.flush()
+                geocoded = [log for log in logs_to_geocode if log.latitude is not None]
+                geocoded_days = {log.log_date for log in geocoded}
+                geocoded_ids = [log.id for log in geocoded]
+                heatmap_service.refresh_days(db, geocoded_days)
                 db.commit()
-                # Clear cache after geocoding
-                cache.clear_pattern("logs:*")
-                cache.clear_pattern("log:*")
+                # Invalidate cached lists and logs after geocoding
+                cache.invalidate(*namespaces_for_days(geocoded_days))
+                event_service.publish_logs(db, GEOCODED, geocoded_ids)
                 
             print(f"Geocoded {geocoded_count} logs")
             return geocoded_count
@@ -246,41 +314,145 @@ class JeccScraper:
         finally:
             db.close()
 
-    def scrape_date_range(self, start_date: datetime, end_date: Optional[datetime] = None) -> int:
-        """Scrape logs for a date range."""
+    def fetch_and_parse(self, log_date: datetime) -> List[Dict]:
+        """Fetch and parse the logs for one date; empty when there are none."""
+        logs_html = self.fetch_jecc_logs(log_date)
+        if not logs_html.strip():
+            print(f"No data found for {log_date.strftime('%m/%d/%Y')}")
+            return []
+        
+        logs_data = self.parse_jecc_logs(logs_html)
+        if not logs_data:
+            print(f"No logs parsed for {log_date.strftime('%m/%d/%Y')}")
+        return logs_data
+
+    def close_session(self) -> None:
+        """Close the calling thread's HTTP session, if it has one."""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            session.close()
+            self._local.session = None
+
+    def scrape_date_range(self, start_date: datetime, end_date: Optional[datetime] = None,
+                          concurrency: Optional[int] = None) -> int:
+        """
+        Scrape logs for a date range.
+        Up to `concurrency` threads fetch and parse days in parallel, with request
+        starts spaced by scrape_min_interval. Parsed days go through a bounded
+        queue to a single writer (this thread), so database writes overlap with
+        fetching and a slow database holds the fetchers back. Days are written
+        in the order they finish, not in date order.
+        
+        An exception while parsing, or in the writer, stops the run and is
+        raised here; fetchers then exit after their current request.
+        """
         if end_date is None:
             end_date = start_date
-            
-        total_inserted = 0
-        current_date = start_date
+        concurrency = max(1, concurrency or settings.scrape_concurrency)
         
+        dates: queue.Queue = queue.Queue()
+        current_date = start_date
         while current_date <= end_date:
-            print(f"Scraping {current_date.strftime('%m/%d/%Y')}...")
-            
-            logs_html = self.fetch_jecc_logs(current_date)
-            if not logs_html.strip():
-                print(f"No data found for {current_date.strftime('%m/%d/%Y')}")
-                current_date += timedelta(days=1)
-                continue
-
-            logs_data = self.parse_jecc_logs(logs_html)
-            if not logs_data:
-                print(f"No logs parsed for {current_date.strftime('%m/%d/%Y')}")
-                current_date += timedelta(days=1)
-                continue
-
-            inserted = self.upsert_logs_to_database(logs_data, current_date)
-            total_inserted += inserted
-            
+            dates.put(current_date)
             current_date += timedelta(days=1)
+        concurrency = min(concurrency, dates.qsize()) or 1
+        
+        parsed: queue.Queue = queue.Queue(maxsize=settings.scrape_queue_size)
+        stop = threading.Event()
+        
+        def offer(item) -> bool:
+            # Wait for room in the queue, unless the writer has stopped reading it
+            while not stop.is_set():
+                try:
+                    parsed.put(item, timeout=QUEUE_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def fetch_worker():
+            try:
+                while not stop.is_set():
+                    try:
+                        log_date = dates.get_nowait()
+                    except queue.Empty:
+                        return
+                    print(f"Scraping {log_date.strftime('%m/%d/%Y')}...")
+                    logs_data = self.fetch_and_parse(log_date)
+                    if logs_data and not offer((log_date, logs_data)):
+                        return
+            except Exception as e:
+                # Re-raised by the writer
+                offer(e)
+            finally:
+                # Tell the writer this fetcher is done
+                offer(None)
+                self.close_session()
+        
+        workers = [threading.Thread(target=fetch_worker, daemon=True) for _ in range(concurrency)]
+        for worker in workers:
+            worker.start()
+        
+        total_inserted = 0
+        finished = 0
+        try:
+            while finished < len(workers):
+                item = parsed.get()
+                if item is None:
+                    finished += 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                log_date, logs_data = item
+                total_inserted += self.upsert_logs_to_database(logs_data, log_date)
+        finally:
+            # On failure or interruption, fetchers blocked on the full queue give
+            # up and the rest stop after their current request
+            stop.set()
             
         return total_inserted
 
-    def scrape_recent_days(self, days: int = 7) -> int:
+    def backfill_summaries(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> int:
+        """Rebuild facet, rollup and heatmap summaries for a date range (all history by default)."""
+        db = SessionLocal()
+        
+        try:
+            if start_date is None or end_date is None:
+                first_date, last_date = db.query(func.min(JeccLog.log_date), func.max(JeccLog.log_date)).one()
+                if first_date is None:
+                    return 0
+                start = start_date.date() if start_date else first_date
+                end = end_date.date() if end_date else last_date
+            else:
+                start, end = start_date.date(), end_date.date()
+            
+            # Commit a month at a time so a long backfill doesn't hold one huge transaction
+            days = 0
+            current = start
+            while current <= end:
+                chunk_end = min(current + timedelta(days=30), end)
+                summary_service.refresh_range(db, current, chunk_end)
+                heatmap_service.refresh_range(db, current, chunk_end)
+                db.commit()
+                days += (chunk_end - current).days + 1
+                print(f"Rebuilt summaries for {current.strftime('%m/%d/%Y')} - {chunk_end.strftime('%m/%d/%Y')}")
+                current = chunk_end + timedelta(days=1)
+            
+            cache.invalidate(LOGS_NAMESPACE, HISTORY_NAMESPACE)
+            return days
+            
+        except Exception as e:
+            db.rollback()
+            print(f"Error rebuilding summaries: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def scrape_recent_days(self, days: int = 7, concurrency: Optional[int] = None) -> int:
         """Scrape logs for the last N days."""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days-1)
-        return self.scrape_date_range(start_date, end_date)
+        return self.scrape_date_range(start_date, end_date, concurrency)
 
 
 # Global scraper instance
@@ -0,0 +1,48 @@
+from typing import Dict, Iterable, Type
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import SessionLocal
+from app.models.db import Agency, CallType
+
+
+class DimensionService:
+    """Resolves agency and call type names to their lookup table ids"""
+
+    def __init__(self):
+        self._ids: Dict[str, Dict[str, int]] = {}
+
+    def ensure_ids(self, model: Type, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Return {name: id} for the given names, inserting any that are missing
+        Runs in its own committed transaction so cached ids never point at
+        rows lost to a rollback of the caller's session
+        """
+        known = self._ids.setdefault(model.__tablename__, {})
+        wanted = {name for name in names if name}
+        missing = wanted - known.keys()
+
+        if missing:
+            db = SessionLocal()
+            try:
+                db.execute(
+                    insert(model)
+                    .values([{"name": name} for name in missing])
+                    .on_conflict_do_nothing(index_elements=["name"])
+                )
+                rows = db.query(model.id, model.name).filter(model.name.in_(missing)).all()
+                db.commit()
+            finally:
+                db.close()
+            known.update({name: dim_id for dim_id, name in rows})
+
+        return {name: known[name] for name in wanted}
+
+    def agency_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        return self.ensure_ids(Agency, names)
+
+    def call_type_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        return self.ensure_ids(CallType, names)
+
+
+dimension_service = DimensionService()
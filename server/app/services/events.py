@@ -0,0 +1,110 @@
+import asyncio
+import json
+from typing import AsyncIterator, Iterable, Optional, Set
+
+import orjson
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache, async_cache
+from app.core.config import settings
+from app.models.db import JeccLog
+from app.services.export import EXPORT_COLUMNS
+
+# Pub/sub channel carrying {"event": ..., "log": {...}} messages for committed log changes
+LOG_EVENTS_CHANNEL = "logs:events"
+
+# Event types
+INSERTED = "inserted"
+UPDATED = "updated"
+GEOCODED = "geocoded"
+
+
+class EventService:
+    @staticmethod
+    def publish_logs(db: Session, event: str, ids: Iterable[int]) -> int:
+        """
+        Publish committed logs as events of one type, oldest first
+        Rows are re-read in one query, in the same shape as exports. Publishing
+        is best effort: a Redis failure never fails the write that triggered it.
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+        rows = db.execute(
+            select(*EXPORT_COLUMNS)
+            .where(JeccLog.id.in_(ids))
+            .order_by(JeccLog.log_date, JeccLog.log_time, JeccLog.id)
+        ).mappings()
+        try:
+            pipe = cache.redis_client.pipeline(transaction=False)
+            for row in rows:
+                pipe.publish(LOG_EVENTS_CHANNEL, orjson.dumps({"event": event, "log": dict(row)}))
+            return len(pipe.execute())
+        except redis.RedisError:
+            return 0
+
+
+class EventHub:
+    """
+    Fans log events out to the SSE clients of one API worker
+    A single subscription per worker feeds a bounded queue per client. A client
+    that falls behind is disconnected rather than silently skipping events.
+    """
+
+    def __init__(self):
+        self._queues: Set[asyncio.Queue] = set()
+
+    async def run(self) -> None:
+        """Follow the events channel until cancelled, reconnecting on errors"""
+        while True:
+            pubsub = async_cache.pubsub_client.pubsub()
+            try:
+                await pubsub.subscribe(LOG_EVENTS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._broadcast(message["data"])
+            except redis.RedisError:
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
+
+    def _broadcast(self, data: str) -> None:
+        try:
+            event = json.loads(data)["event"]
+        except (KeyError, TypeError, ValueError):
+            return
+        # Render the frame once for every client
+        frame = f"event: {event}\ndata: {data}\n\n"
+        for queue in list(self._queues):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Make room for the end-of-stream marker
+                self._queues.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def stream(self) -> AsyncIterator[str]:
+        """SSE frames for one client, with comment lines as keepalives"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.event_queue_size)
+        self._queues.add(queue)
+        try:
+            yield f"retry: {settings.event_retry_ms}\n\n"
+            while True:
+                try:
+                    frame: Optional[str] = await asyncio.wait_for(queue.get(), settings.event_keepalive)
+                except asyncio.TimeoutError:
+                    frame = ": keepalive\n\n"
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self._queues.discard(queue)
+
+
+# Global instances
+event_service = EventService()
+event_hub = EventHub()
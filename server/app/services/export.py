@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+from typing import Iterator, List
+
+from sqlalchemy import Date, DateTime, Float, Integer, Select, Time, cast
+
+from app.core.database import ReadSessionLocal
+from app.models.db import JeccLog
+
+# Columns included in exports, in output order
+EXPORT_COLUMNS = [
+    JeccLog.id,
+    JeccLog.cfs_number,
+    JeccLog.log_date,
+    JeccLog.log_time,
+    JeccLog.address,
+    JeccLog.apt_suite,
+    JeccLog.call_type,
+    JeccLog.agency,
+    JeccLog.disposition,
+    JeccLog.incident_number,
+    cast(JeccLog.latitude, Float).label("latitude"),
+    cast(JeccLog.longitude, Float).label("longitude"),
+    JeccLog.geocoded_address,
+    JeccLog.geocoded_at,
+    JeccLog.created_at,
+    JeccLog.updated_at,
+]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    def __init__(self, batch_size: int = 5000):
+        self.batch_size = batch_size
+
+    def stream(self, stmt: Select, fmt: str) -> Iterator[bytes]:
+        """
+        Run one query over a server-side cursor and yield the encoded result in chunks
+        Opens its own session because the response body outlives the request handler
+        """
+        db = ReadSessionLocal()
+        try:
+            result = db.execute(stmt.execution_options(yield_per=self.batch_size))
+            columns = list(result.keys())
+            batches = result.partitions()
+            if fmt == "csv":
+                yield from self._csv(columns, batches)
+            elif fmt == "parquet":
+                yield from self._parquet(columns, batches)
+            else:
+                yield from self._ndjson(columns, batches)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _ndjson(columns, batches) -> Iterator[bytes]:
+        for rows in batches:
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows
+            ).encode()
+
+    @staticmethod
+    def _csv(columns, batches) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for rows in batches:
+            writer.writerows(rows)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def _parquet(columns, batches) -> Iterator[bytes]:
+        # pyarrow is only needed for Parquet exports
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        column_types = {column.key: column.type for column in EXPORT_COLUMNS}
+
+        def arrow_type(name):
+            sql_type = column_types.get(name)
+            if isinstance(sql_type, Integer):
+                return pa.int64()
+            if isinstance(sql_type, Float):
+                return pa.float64()
+            if isinstance(sql_type, DateTime):
+                return pa.timestamp("us", tz="UTC")
+            if isinstance(sql_type, Date):
+                return pa.date32()
+            if isinstance(sql_type, Time):
+                return pa.time64("us")
+            return pa.string()
+
+        # An explicit schema keeps row groups consistent even when a batch is all NULL
+        schema = pa.schema([(name, arrow_type(name)) for name in columns])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        for rows in batches:
+            writer.write_table(pa.Table.from_pylist([dict(zip(columns, row)) for row in rows], schema=schema))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+
+export_service = ExportService()
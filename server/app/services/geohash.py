@@ -0,0 +1,38 @@
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precision stored on each geocoded log (~5 m cells)
+GEOHASH_PRECISION = 9
+
+
+def encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a coordinate as a geohash string"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def precision_for_zoom(zoom: int) -> int:
+    """Geohash precision giving a handful of cells per Web Mercator tile at a zoom level"""
+    return min(GEOHASH_PRECISION, max(1, (zoom + 1) // 2))
+
@@ -0,0 +1,155 @@
+import struct
+import zlib
+from datetime import date
+from typing import Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import Float, cast, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.db import HeatmapGridDaily, JeccLog
+
+# Fixed grid over Johnson County, IA as (min_lon, min_lat, max_lon, max_lat)
+HEATMAP_BOUNDS = (-91.84, 41.42, -91.36, 41.87)
+GRID_SIZE = 256
+
+# call_type value of the per-day grid covering every call type
+ALL_CALL_TYPES = ""
+
+
+def encode_cells(grid: np.ndarray) -> bytes:
+    """Pack the non-zero cells of a grid as zlib-compressed (flat index, count) arrays"""
+    flat = grid.ravel()
+    indices = np.flatnonzero(flat).astype("<u4")
+    counts = flat[indices].astype("<u4")
+    return zlib.compress(indices.tobytes() + counts.tobytes())
+
+
+def decode_cells(blob: bytes):
+    """Inverse of encode_cells, returning (indices, counts)"""
+    packed = np.frombuffer(zlib.decompress(blob), dtype="<u4")
+    half = len(packed) // 2
+    return packed[:half], packed[half:]
+
+
+class HeatmapService:
+    @staticmethod
+    def histogram(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Bin coordinates into the heatmap grid; row 0 is the northern edge"""
+        min_lon, min_lat, max_lon, max_lat = HEATMAP_BOUNDS
+        grid, _, _ = np.histogram2d(
+            lats, lons, bins=GRID_SIZE, range=[[min_lat, max_lat], [min_lon, max_lon]]
+        )
+        return np.flipud(grid).astype(np.uint32)
+
+    @staticmethod
+    def refresh_range(db: Session, start_date: date, end_date: date) -> None:
+        """Recompute the daily grids for every day in [start_date, end_date]"""
+        db.execute(delete(HeatmapGridDaily).where(HeatmapGridDaily.log_date.between(start_date, end_date)))
+        HeatmapService._insert(db, JeccLog.log_date.between(start_date, end_date))
+
+    @staticmethod
+    def refresh_days(db: Session, log_dates: Iterable[date]) -> None:
+        """Recompute the daily grids for specific days, e.g. after geocoding"""
+        log_dates = sorted(set(log_dates))
+        if not log_dates:
+            return
+        db.execute(delete(HeatmapGridDaily).where(HeatmapGridDaily.log_date.in_(log_dates)))
+        HeatmapService._insert(db, JeccLog.log_date.in_(log_dates))
+
+    @staticmethod
+    def _insert(db: Session, date_filter) -> None:
+        rows = db.execute(
+            select(
+                JeccLog.log_date,
+                JeccLog.call_type,
+                cast(JeccLog.latitude, Float),
+                cast(JeccLog.longitude, Float),
+            ).where(date_filter, JeccLog.latitude.isnot(None), JeccLog.longitude.isnot(None))
+        ).all()
+        if not rows:
+            return
+
+        log_dates, call_types, lats, lons = zip(*rows)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        call_types = np.asarray([call_type or ALL_CALL_TYPES for call_type in call_types], dtype=object)
+        log_dates = np.asarray(log_dates, dtype=object)
+
+        records = []
+        for log_date in np.unique(log_dates):
+            on_day = log_dates == log_date
+            day_types = call_types[on_day]
+            day_lats, day_lons = lats[on_day], lons[on_day]
+            groups = [(ALL_CALL_TYPES, slice(None))]
+            groups += [(call_type, day_types == call_type) for call_type in np.unique(day_types) if call_type]
+            for call_type, mask in groups:
+                grid = HeatmapService.histogram(day_lats[mask], day_lons[mask])
+                total = int(grid.sum())
+                if total:
+                    records.append({
+                        "log_date": log_date,
+                        "call_type": call_type,
+                        "count": total,
+                        "cells": encode_cells(grid),
+                    })
+
+        if records:
+            db.execute(HeatmapGridDaily.__table__.insert(), records)
+
+    @staticmethod
+    async def get_grid(
+        db: AsyncSession,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        call_type: Optional[str] = None,
+    ) -> np.ndarray:
+        """Sum the stored daily grids over a date range into a GRID_SIZE x GRID_SIZE array"""
+        query = select(HeatmapGridDaily.cells).where(
+            HeatmapGridDaily.call_type == (call_type or ALL_CALL_TYPES)
+        )
+        if start_date:
+            query = query.where(HeatmapGridDaily.log_date >= start_date)
+        if end_date:
+            query = query.where(HeatmapGridDaily.log_date <= end_date)
+
+        indices: List[np.ndarray] = []
+        counts: List[np.ndarray] = []
+        for (blob,) in await db.execute(query):
+            day_indices, day_counts = decode_cells(blob)
+            indices.append(day_indices)
+            counts.append(day_counts)
+
+        if not indices:
+            return np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.float32)
+        flat = np.bincount(
+            np.concatenate(indices), weights=np.concatenate(counts), minlength=GRID_SIZE * GRID_SIZE
+        )
+        return flat.reshape(GRID_SIZE, GRID_SIZE).astype(np.float32)
+
+    @staticmethod
+    def render_png(grid: np.ndarray) -> bytes:
+        """Render a density grid as an RGBA PNG with a log-scaled red ramp"""
+        peak = grid.max()
+        intensity = np.log1p(grid) / np.log1p(peak) if peak > 0 else grid
+        rgba = np.zeros(grid.shape + (4,), dtype=np.uint8)
+        rgba[..., 0] = 255
+        rgba[..., 1] = (200 * (1 - intensity)).astype(np.uint8)
+        rgba[..., 3] = (230 * intensity).astype(np.uint8)
+
+        def chunk(tag: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+        height, width = grid.shape
+        # Each scanline is prefixed with filter type 0 (none)
+        raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rgba.reshape(height, width * 4)])
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw.tobytes()))
+            + chunk(b"IEND", b"")
+        )
+
+
+heatmap_service = HeatmapService()
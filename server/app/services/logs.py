@@ -1,12 +1,138 @@
+import json
+from sqlalchemy import Integer, Select, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from datetime import date, datetime
 from typing import List, Optional
 
-from app.models.db import JeccLog
+from app.core.cache import cache, namespaces_for_days
+from app.models.db import Agency, CallType, JeccLog
 from app.services.geocode import geocoding_service
+from app.services import geohash, spatial
+from app.services.heatmap import heatmap_service
+from app.services.events import event_service, GEOCODED
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper that keeps the wrapped statement's bind parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+# updated_at for writes: the clock when the row is written, not when the
+# transaction began, so /logs/changes watermarks trail commits as closely as possible
+CHANGE_TIMESTAMP = func.clock_timestamp()
 
 
 class LogsService:
+    @staticmethod
+    def build_filters(
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        agency: Optional[str] = None,
+        call_type: Optional[str] = None,
+        geocoded_only: Optional[bool] = None,
+        bbox: Optional[tuple] = None,
+        near: Optional[tuple] = None,
+        radius_m: Optional[float] = None,
+        exact_match: bool = False,
+    ) -> list:
+        """
+        Build the SQLAlchemy filter clauses shared by the log list endpoints
+        bbox is (min_lon, min_lat, max_lon, max_lat); near is (lat, lon) with radius_m
+        exact_match compares agency/call_type by lookup id instead of substring
+        """
+        filters = []
+        if start_date:
+            filters.append(JeccLog.log_date >= start_date)
+        if end_date:
+            filters.append(JeccLog.log_date <= end_date)
+        if agency:
+            if exact_match:
+                agency_id = select(Agency.id).where(Agency.name == agency).scalar_subquery()
+                filters.append(JeccLog.agency_id == agency_id)
+            else:
+                filters.append(JeccLog.agency.ilike(f"%{agency}%"))
+        if call_type:
+            if exact_match:
+                call_type_id = select(CallType.id).where(CallType.name == call_type).scalar_subquery()
+                filters.append(JeccLog.call_type_id == call_type_id)
+            else:
+                filters.append(JeccLog.call_type.ilike(f"%{call_type}%"))
+        if geocoded_only:
+            filters.append(JeccLog.latitude.isnot(None))
+            filters.append(JeccLog.longitude.isnot(None))
+        if bbox:
+            filters.append(spatial.within_bbox(*bbox))
+        if near and radius_m:
+            filters.extend(spatial.within_radius(near[0], near[1], radius_m))
+        return filters
+
+    @staticmethod
+    async def count_logs(db: AsyncSession, filters: list, mode: str = "exact") -> Optional[int]:
+        """
+        Count the logs matched by a list of filter clauses
+        mode is "exact" (COUNT(*)), "estimate" (planner row estimate) or "none"
+        """
+        if mode == "none":
+            return None
+        if mode == "estimate":
+            return await LogsService.estimate_count(db, select(JeccLog.id).where(*filters))
+        return await db.scalar(select(func.count()).select_from(JeccLog).where(*filters))
+
+    @staticmethod
+    async def estimate_count(db: AsyncSession, stmt: Select) -> int:
+        """Estimate the row count of a statement from Postgres planner statistics"""
+        plan = await db.scalar(Explain(stmt))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    async def get_logs_by_ids(db: AsyncSession, ids: List[int]) -> List[JeccLog]:
+        """
+        Load several logs in one query, in no particular order
+        The ids are bound as a single array so every batch size shares one plan
+        """
+        if not ids:
+            return []
+        return list(await db.scalars(
+            select(JeccLog).where(JeccLog.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))))
+        ))
+    
+    @staticmethod
+    def geocode_fields(latitude: float, longitude: float, formatted_address: Optional[str]) -> dict:
+        """
+        Column values to write when a log gets coordinates
+        Usable both as a query.update() payload and via apply_geocode(). Bulk
+        updates skip the ORM onupdate hook, so updated_at is set explicitly
+        (see CHANGE_TIMESTAMP) for /logs/changes to pick the row up.
+        """
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "geohash": geohash.encode(float(latitude), float(longitude)),
+            "geocoded_address": formatted_address,
+            "geocoded_at": datetime.utcnow(),
+            "updated_at": CHANGE_TIMESTAMP,
+        }
+
+    @staticmethod
+    def apply_geocode(log: JeccLog, latitude: float, longitude: float, formatted_address: Optional[str]) -> None:
+        """Set coordinates and derived columns on a log instance"""
+        for column, value in LogsService.geocode_fields(latitude, longitude, formatted_address).items():
+            setattr(log, column, value)
+
     @staticmethod
     def geocode_log(db: Session, log: JeccLog) -> bool:
         """
@@ -19,12 +145,14 @@ class LogsService:
         geocode_result = geocoding_service.geocode_address(log.address)
         if geocode_result:
             lat, lon, formatted_address = geocode_result
-            log.latitude = lat
-            log.longitude = lon
-            log.geocoded_address = formatted_address
-            log.geocoded_at = datetime.utcnow()
+            LogsService.apply_geocode(log, lat, lon, formatted_address)
+            db.flush()
+            log_id, log_date = log.id, log.log_date
+            heatmap_service.refresh_days(db, [log_date])
             
             db.commit()
+            cache.invalidate(*namespaces_for_days([log_date]))
+            event_service.publish_logs(db, GEOCODED, [log_id])
             return True
             
         return False
@@ -0,0 +1,52 @@
+import math
+
+from sqlalchemy import Float, cast, func, literal
+
+from app.models.db import JeccLog, LONGITUDE_SCALE
+
+# Length of one degree of latitude (and of longitude at the equator)
+METERS_PER_DEGREE = 111320.0
+
+
+def _point(longitude: float, latitude: float):
+    return func.point(literal(longitude), literal(latitude))
+
+
+def within_bbox(min_lon: float, min_lat: float, max_lon: float, max_lat: float):
+    """Filter logs whose location falls inside a bounding box (GiST indexed)"""
+    return JeccLog.location.op("<@")(func.box(_point(min_lon, min_lat), _point(max_lon, max_lat)))
+
+
+def distance_m(latitude: float, longitude: float):
+    """
+    SQL expression for the distance in meters from a log to a coordinate
+    Uses an equirectangular approximation, accurate to well under 1% at county scale
+    """
+    lon_scale = math.cos(math.radians(latitude))
+    dlat = cast(JeccLog.latitude, Float) - latitude
+    dlon = (cast(JeccLog.longitude, Float) - longitude) * lon_scale
+    return func.sqrt(dlat * dlat + dlon * dlon) * METERS_PER_DEGREE
+
+
+def radius_bbox(latitude: float, longitude: float, radius_m: float) -> tuple:
+    """Bounding box (min_lon, min_lat, max_lon, max_lat) enclosing a radius"""
+    dlat = radius_m / METERS_PER_DEGREE
+    dlon = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+    return longitude - dlon, latitude - dlat, longitude + dlon, latitude + dlat
+
+
+def within_radius(latitude: float, longitude: float, radius_m: float) -> list:
+    """Filters selecting logs within radius_m meters of a coordinate"""
+    return [
+        within_bbox(*radius_bbox(latitude, longitude, radius_m)),
+        distance_m(latitude, longitude) <= radius_m,
+    ]
+
+
+def nearest_order(latitude: float, longitude: float):
+    """
+    ORDER BY expression for a k-nearest-neighbour scan of the GiST index
+    Runs on location_scaled, where a degree of longitude is as long as a degree
+    of latitude, so the scan visits logs in (nearly) true distance order
+    """
+    return JeccLog.location_scaled.op("<->")(_point(longitude * LONGITUDE_SCALE, latitude))
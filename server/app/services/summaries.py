@@ -0,0 +1,139 @@
+from datetime import date, datetime, time
+from typing import Dict, List, Optional
+
+from sqlalchemy import SmallInteger, cast, delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.db import JeccLog, LogCountDaily, LogCountHourly, LogFacetDaily
+
+# Facet dimension name -> source column on jecc_logs
+FACET_COLUMNS = {
+    "agency": JeccLog.agency,
+    "call_type": JeccLog.call_type,
+    "disposition": JeccLog.disposition,
+}
+
+# Rollup rows key unknown agencies/call types as '' since they are part of the primary key
+ROLLUP_AGENCY = func.coalesce(JeccLog.agency, "")
+ROLLUP_CALL_TYPE = func.coalesce(JeccLog.call_type, "")
+
+
+class SummaryService:
+    @staticmethod
+    def refresh_day(db: Session, log_date: date) -> None:
+        """
+        Recompute the summary rows for a single day from jecc_logs
+        Runs inside the caller's transaction so summaries commit with the logs
+        """
+        SummaryService.refresh_range(db, log_date, log_date)
+
+    @staticmethod
+    def refresh_range(db: Session, start_date: date, end_date: date) -> None:
+        """Recompute facet and rollup rows for every day in [start_date, end_date]"""
+        in_range = JeccLog.log_date.between(start_date, end_date)
+
+        db.execute(delete(LogFacetDaily).where(LogFacetDaily.log_date.between(start_date, end_date)))
+        for dimension, column in FACET_COLUMNS.items():
+            db.execute(
+                insert(LogFacetDaily).from_select(
+                    ["log_date", "dimension", "value", "count"],
+                    select(JeccLog.log_date, literal(dimension), column, func.count())
+                    .where(in_range, column.isnot(None))
+                    .group_by(JeccLog.log_date, column)
+                )
+            )
+
+        db.execute(delete(LogCountDaily).where(LogCountDaily.log_date.between(start_date, end_date)))
+        db.execute(
+            insert(LogCountDaily).from_select(
+                ["log_date", "agency", "call_type", "count"],
+                select(JeccLog.log_date, ROLLUP_AGENCY, ROLLUP_CALL_TYPE, func.count())
+                .where(in_range)
+                .group_by(JeccLog.log_date, ROLLUP_AGENCY, ROLLUP_CALL_TYPE)
+            )
+        )
+
+        hour = cast(func.extract("hour", JeccLog.log_time), SmallInteger)
+        db.execute(delete(LogCountHourly).where(LogCountHourly.log_date.between(start_date, end_date)))
+        db.execute(
+            insert(LogCountHourly).from_select(
+                ["log_date", "hour", "agency", "call_type", "count"],
+                select(JeccLog.log_date, hour, ROLLUP_AGENCY, ROLLUP_CALL_TYPE, func.count())
+                .where(in_range, JeccLog.log_time.isnot(None))
+                .group_by(JeccLog.log_date, hour, ROLLUP_AGENCY, ROLLUP_CALL_TYPE)
+            )
+        )
+
+    @staticmethod
+    async def get_facets(
+        db: AsyncSession, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> Dict[str, List[dict]]:
+        """Distinct values with counts per facet dimension, most common first"""
+        total = func.sum(LogFacetDaily.count).label("total")
+        query = select(LogFacetDaily.dimension, LogFacetDaily.value, total)
+        if start_date:
+            query = query.where(LogFacetDaily.log_date >= start_date)
+        if end_date:
+            query = query.where(LogFacetDaily.log_date <= end_date)
+        query = query.group_by(LogFacetDaily.dimension, LogFacetDaily.value)\
+            .order_by(LogFacetDaily.dimension, total.desc(), LogFacetDaily.value)
+
+        facets = {dimension: [] for dimension in FACET_COLUMNS}
+        for dimension, value, count in await db.execute(query):
+            facets[dimension].append({"value": value, "count": int(count)})
+        return facets
+
+    @staticmethod
+    async def get_timeseries(
+        db: AsyncSession,
+        interval: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        agency: Optional[str] = None,
+        call_type: Optional[str] = None,
+        group_by: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Call counts per hour, day or week from the rollup tables
+        interval is "hour", "day" or "week"; group_by is None, "agency" or "call_type"
+        Returns [{"bucket": datetime, "group": str or None, "count": int}] in bucket order
+        """
+        table = LogCountHourly if interval == "hour" else LogCountDaily
+        if interval == "hour":
+            bucket_columns = [table.log_date, table.hour]
+        elif interval == "week":
+            bucket_columns = [cast(func.date_trunc("week", table.log_date), table.log_date.type)]
+        else:
+            bucket_columns = [table.log_date]
+        # Ungrouped series select no group column; an untyped NULL parameter
+        # can't be prepared by asyncpg
+        group_columns = [getattr(table, group_by)] if group_by else []
+
+        query = select(*bucket_columns, *group_columns, func.sum(table.count))
+        if start_date:
+            query = query.where(table.log_date >= start_date)
+        if end_date:
+            query = query.where(table.log_date <= end_date)
+        if agency:
+            query = query.where(table.agency == agency)
+        if call_type:
+            query = query.where(table.call_type == call_type)
+        group_keys = bucket_columns + group_columns
+        query = query.group_by(*group_keys).order_by(*group_keys)
+
+        points = []
+        for row in await db.execute(query):
+            if not group_by:
+                row = (*row[:-1], None, row[-1])
+            if interval == "hour":
+                log_date, hour, group, count = row
+                bucket = datetime.combine(log_date, time(hour))
+            else:
+                log_date, group, count = row
+                bucket = datetime.combine(log_date, time(0))
+            points.append({"bucket": bucket, "group": group, "count": int(count)})
+        return points
+
+
+summary_service = SummaryService()
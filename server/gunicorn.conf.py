@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for production serving: one uvicorn worker per core
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Worker count, preloading and pool budgets come from app settings
+(WEB_WORKERS, WEB_PRELOAD, DATABASE_MAX_CONNECTIONS, REDIS_MAX_CONNECTIONS).
+"""
+from app.core.config import settings
+
+bind = f"{settings.api_host}:{settings.api_port}"
+workers = settings.worker_count
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = settings.web_preload
+
+# Workers warm their pools and caches in the lifespan before serving
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    # Pools are inherited from the master when preloading; connections must
+    # never be shared across processes, so each worker starts with an empty
+    # sync pool. Async pools are left alone: preloading opens no async
+    # connections, and disposing one outside a running event loop rebuilds
+    # it with a threading lock that deadlocks concurrent first connects.
+    from app.core.database import engine, replica_router
+    engine.dispose(close=False)
+    for replica in replica_router.replicas:
+        replica.engine.dispose(close=False)